@@ -11,148 +11,166 @@ Strategy:
 This preserves intentional name changes while fixing OCR errors.
 """
 
+import numpy as np
 import pandas as pd
 import argparse
+import csv
 from pathlib import Path
 from collections import Counter, defaultdict
-from rapidfuzz import fuzz
+from concurrent.futures import ThreadPoolExecutor
+from rapidfuzz import fuzz, process
 import sys
 
+# Every variant must be at least this similar to the consensus name
+MIN_VARIANT_SIMILARITY = 60
 
-def load_high_confidence_links(links_dir: Path) -> pd.DataFrame:
-    """Load only SAME_AS links with perfect spatial match (IoU = 1.0)."""
-    all_links = []
+
+def read_same_as_links(filepath: Path, columns: list) -> pd.DataFrame:
+    """Read only the needed columns of a link CSV and keep perfect SAME_AS matches."""
+    # Low-cardinality text columns are dictionary-encoded as categories
+    dtype = {'relationship': 'category', 'iou': 'float64'}
+    dtype.update({c: 'category' for c in columns if c.startswith(('cd_name_', 'pr_'))})
+    df = pd.read_csv(filepath, usecols=['relationship', 'iou'] + columns, dtype=dtype)
+    return df[(df['relationship'] == 'SAME_AS') & (df['iou'] >= 0.999)]
+
+
+def load_high_confidence_links(links_dir: Path) -> dict:
+    """
+    Load only SAME_AS links with perfect spatial match (IoU = 1.0).
+
+    Returns:
+        Dict mapping (year_from, year_to) -> DataFrame of links for that pair
+    """
+    links_by_pair = {}
 
     year_pairs = [
         (1851, 1861), (1861, 1871), (1871, 1881), (1881, 1891),
         (1891, 1901), (1901, 1911), (1911, 1921)
     ]
 
+    # (year_from, year_to, filepath) for every link file present; the high
+    # confidence file comes before the ambiguous SAME_AS file for each pair
+    link_files = []
     for year_from, year_to in year_pairs:
-        # High confidence links
-        high_conf_file = links_dir / f"year_links_{year_from}_{year_to}.csv"
-        if high_conf_file.exists():
-            df = pd.read_csv(high_conf_file)
-            df = df[(df['relationship'] == 'SAME_AS') & (df['iou'] >= 0.999)]
-            all_links.append(df)
+        for file_type in ['year_links', 'ambiguous']:
+            filepath = links_dir / f"{file_type}_{year_from}_{year_to}.csv"
+            if filepath.exists():
+                link_files.append((year_from, year_to, filepath))
+
+    def read_link_file(entry):
+        year_from, year_to, filepath = entry
+        columns = [f'tcpuid_{year_from}', f'tcpuid_{year_to}',
+                   f'csd_name_{year_to}', f'cd_name_{year_to}', f'pr_{year_to}']
+        return read_same_as_links(filepath, columns)
+
+    # Parse all files concurrently; the C parser releases the GIL
+    with ThreadPoolExecutor() as executor:
+        frames = list(executor.map(read_link_file, link_files))
 
-        # Ambiguous SAME_AS with perfect spatial match
-        ambig_file = links_dir / f"ambiguous_{year_from}_{year_to}.csv"
-        if ambig_file.exists():
-            df = pd.read_csv(ambig_file)
-            df = df[(df['relationship'] == 'SAME_AS') & (df['iou'] >= 0.999)]
-            all_links.append(df)
+    pair_links = defaultdict(list)
+    for (year_from, year_to, _), df in zip(link_files, frames):
+        pair_links[(year_from, year_to)].append(df)
 
-    return pd.concat(all_links, ignore_index=True)
+    for pair, dfs in pair_links.items():
+        links_by_pair[pair] = pd.concat(dfs, ignore_index=True)
 
+    return links_by_pair
 
-def build_chains(links_df: pd.DataFrame) -> dict:
+
+def build_chains(links_by_pair: dict) -> dict:
     """
     Build temporal chains of CSDs.
 
+    Chains are the connected components of the SAME_AS graph over
+    (tcpuid, year) nodes. Nodes are factorized to integer ids, edges kept as
+    parallel arrays, and components found with array operations.
+
     Returns:
         Dict mapping chain_id -> [(year, tcpuid, csd_name, cd_name, pr), ...]
     """
     print("Building temporal chains from perfect spatial matches...", file=sys.stderr)
 
-    # Build adjacency: (tcpuid, year) -> (next_tcpuid, next_year, name, cd, pr)
-    graph = defaultdict(list)
-
-    for _, row in links_df.iterrows():
-        # Extract year_from and year_to from column names
-        year_cols = [c for c in row.index if c.startswith('tcpuid_')]
-        years = sorted([int(c.split('_')[1]) for c in year_cols])
-        year_from, year_to = years[0], years[1]
-
-        tcpuid_from = row[f'tcpuid_{year_from}']
-        tcpuid_to = row[f'tcpuid_{year_to}']
-        name_to = row[f'csd_name_{year_to}']
-        cd_to = row[f'cd_name_{year_to}']
-        pr_to = row[f'pr_{year_to}']
-
-        graph[(tcpuid_from, year_from)].append((tcpuid_to, year_to, name_to, cd_to, pr_to))
-
-    # Find chain starting points (earliest year for each CSD)
-    all_nodes = set(graph.keys())
-    for children in graph.values():
-        for tcpuid, year, _, _, _ in children:
-            all_nodes.add((tcpuid, year))
-
-    starts = []
-    for tcpuid, year in all_nodes:
-        # Check if this node has no incoming edges
-        is_start = True
-        for _, prev_year, prev_children in [(k[0], k[1], v) for k, v in graph.items()]:
-            for next_tcpuid, next_year, _, _, _ in prev_children:
-                if next_tcpuid == tcpuid and next_year == year:
-                    is_start = False
-                    break
-            if not is_start:
-                break
-
-        if is_start:
-            starts.append((tcpuid, year))
-
-    # Build chains from starting points
+    # Edge arrays: one entry per SAME_AS link
+    src_tcpuids, src_years, dst_tcpuids, dst_years = [], [], [], []
+    names, cds, prs = [], [], []
+    for (year_from, year_to), links_df in links_by_pair.items():
+        n_links = len(links_df)
+        src_tcpuids.append(links_df[f'tcpuid_{year_from}'].to_numpy(dtype=object))
+        src_years.append(np.full(n_links, year_from))
+        dst_tcpuids.append(links_df[f'tcpuid_{year_to}'].to_numpy(dtype=object))
+        dst_years.append(np.full(n_links, year_to))
+        names.append(links_df[f'csd_name_{year_to}'].to_numpy(dtype=object))
+        cds.append(links_df[f'cd_name_{year_to}'].to_numpy(dtype=object))
+        prs.append(links_df[f'pr_{year_to}'].to_numpy(dtype=object))
+
+    if not src_tcpuids:
+        print("  Found 0 temporal chains", file=sys.stderr)
+        return {}
+
+    n_edges = sum(len(a) for a in src_tcpuids)
+    names, cds, prs = np.concatenate(names), np.concatenate(cds), np.concatenate(prs)
+
+    # Integer node ids for every (tcpuid, year) endpoint
+    node_keys = pd.MultiIndex.from_arrays([
+        np.concatenate(src_tcpuids + dst_tcpuids),
+        np.concatenate(src_years + dst_years),
+    ])
+    codes, nodes = pd.factorize(node_keys)
+    src, dst = codes[:n_edges], codes[n_edges:]
+    n_nodes = len(nodes)
+    node_tcpuids = nodes.get_level_values(0).to_numpy(dtype=object)
+    node_years = nodes.get_level_values(1).to_numpy()
+
+    # Connected components by min-label propagation: every node repeatedly
+    # takes the smallest label across its edges, with pointer jumping, until
+    # all edges join equally-labelled nodes
+    roots = np.arange(n_nodes)
+    while True:
+        edge_labels = np.minimum(roots[src], roots[dst])
+        labels = roots.copy()
+        np.minimum.at(labels, src, edge_labels)
+        np.minimum.at(labels, dst, edge_labels)
+        labels = labels[labels]
+        if np.array_equal(labels, roots):
+            break
+        roots = labels
+
+    # Node attributes come from the first edge into the node; chain starts
+    # (no incoming edge) borrow CD/province from their first outgoing edge
+    incoming_edge = np.full(n_nodes, -1)
+    targets, first_in = np.unique(dst, return_index=True)
+    incoming_edge[targets] = first_in
+    outgoing_edge = np.full(n_nodes, -1)
+    sources, first_out = np.unique(src, return_index=True)
+    outgoing_edge[sources] = first_out
+
+    # Order nodes by year then tcpuid; chains are ordered by their first node
+    node_rank = np.empty(n_nodes, dtype=np.int64)
+    node_rank[np.lexsort((node_tcpuids.astype(str), node_years))] = np.arange(n_nodes)
+    component_rank = np.full(n_nodes, n_nodes, dtype=np.int64)
+    np.minimum.at(component_rank, roots, node_rank)
+    order = np.lexsort((node_rank, component_rank[roots]))
+    boundaries = np.flatnonzero(np.diff(roots[order])) + 1
+
     chains = {}
     chain_id = 0
-    visited = set()
 
-    for start_tcpuid, start_year in starts:
-        if (start_tcpuid, start_year) in visited:
+    for component in np.split(order, boundaries):
+        if len(component) < 2:  # Only keep multi-year chains
             continue
 
         chain = []
-        current = (start_tcpuid, start_year)
-
-        # Get initial name from first link
-        initial_name = None
-        initial_cd = None
-        initial_pr = None
-
-        # Look for this node as a target
-        for (from_tcpuid, from_year), children in graph.items():
-            for to_tcpuid, to_year, name, cd, pr in children:
-                if to_tcpuid == start_tcpuid and to_year == start_year:
-                    initial_name = name
-                    initial_cd = cd
-                    initial_pr = pr
-                    break
-            if initial_name:
-                break
-
-        # If no incoming edge found, try to get name from outgoing
-        if not initial_name and current in graph:
-            children = graph[current]
-            if children:
-                # Use the first child's info for the start node
-                initial_name = f"[Start of chain]"
-                initial_cd = children[0][3]
-                initial_pr = children[0][4]
-
-        chain.append((start_year, start_tcpuid, initial_name or "UNKNOWN", initial_cd or "", initial_pr or ""))
-        visited.add(current)
-
-        # Follow chain forward
-        while current in graph:
-            children = graph[current]
-            if not children:
-                break
-
-            # Take first child (should only be one for SAME_AS)
-            next_tcpuid, next_year, next_name, next_cd, next_pr = children[0]
-            next_node = (next_tcpuid, next_year)
-
-            if next_node in visited:  # Avoid cycles
-                break
-
-            chain.append((next_year, next_tcpuid, next_name, next_cd, next_pr))
-            visited.add(next_node)
-            current = next_node
-
-        if len(chain) > 1:  # Only keep multi-year chains
-            chains[f"chain_{chain_id:05d}"] = chain
-            chain_id += 1
+        for node in component.tolist():
+            edge = incoming_edge[node]
+            if edge >= 0:
+                name, cd, pr = names[edge], cds[edge], prs[edge]
+            else:
+                edge = outgoing_edge[node]
+                name, cd, pr = "[Start of chain]", cds[edge], prs[edge]
+            chain.append((int(node_years[node]), node_tcpuids[node], name or "UNKNOWN", cd or "", pr or ""))
+
+        chains[f"chain_{chain_id:05d}"] = chain
+        chain_id += 1
 
     print(f"  Found {len(chains)} temporal chains", file=sys.stderr)
     return chains
@@ -174,26 +192,30 @@ def find_canonical_name(chain: list, min_similarity: float = 70.0) -> tuple:
     if len(names) < 2:
         return None, False, "insufficient_data", 0
 
+    # Common case: every year uses the same name
+    if len(set(names)) == 1:
+        return names[0], True, "unanimous", 100.0
+
     # Find most common name
     name_counter = Counter(names)
     canonical_name, consensus_count = name_counter.most_common(1)[0]
 
     # Calculate diversity: how similar are all names to consensus?
+    # Score each distinct variant once, weighted by how often it occurs
+    variants = [(name, count) for name, count in name_counter.items() if name != canonical_name]
+    scores = process.cdist(
+        [canonical_name.lower()], [name.lower() for name, _ in variants],
+        scorer=fuzz.ratio, dtype=np.float64
+    )[0]
     similarities = []
-    for name in names:
-        if name != canonical_name:
-            sim = fuzz.ratio(name.lower(), canonical_name.lower())
-            similarities.append(sim)
-
-    if not similarities:
-        # All names are identical
-        return canonical_name, True, "unanimous", 100.0
+    for sim, (_, count) in zip(scores.tolist(), variants):
+        similarities.extend([sim] * count)
 
     avg_similarity = sum(similarities) / len(similarities)
-    min_sim = min(similarities) if similarities else 100
+    min_sim = min(similarities)
 
     # Decision logic
-    if avg_similarity >= min_similarity and min_sim >= 60:
+    if avg_similarity >= min_similarity and min_sim >= MIN_VARIANT_SIMILARITY:
         # Names are similar enough - likely OCR variants
         reason = f"ocr_variants_avg_{avg_similarity:.1f}"
         return canonical_name, True, reason, avg_similarity
@@ -236,64 +258,66 @@ def main():
 
     # Load links
     print(f"Loading temporal links from {args.links_dir}...", file=sys.stderr)
-    links_df = load_high_confidence_links(args.links_dir)
-    print(f"  Loaded {len(links_df)} perfect spatial matches (IoU >= 0.999)", file=sys.stderr)
+    links_by_pair = load_high_confidence_links(args.links_dir)
+    total_links = sum(len(df) for df in links_by_pair.values())
+    print(f"  Loaded {total_links} perfect spatial matches (IoU >= 0.999)", file=sys.stderr)
 
     # Build chains
-    chains = build_chains(links_df)
+    chains = build_chains(links_by_pair)
 
     # Analyze each chain
     print("\nAnalyzing chains for canonical names...", file=sys.stderr)
 
-    mapping_records = []
     chain_records = []
 
     applied_count = 0
     skipped_count = 0
+    mapping_count = 0
 
-    for chain_id, chain in chains.items():
-        canonical_name, should_apply, reason, diversity = find_canonical_name(chain, args.min_similarity)
-
-        # Record chain info
-        all_names = " | ".join([f"{y}:{n}" for y, _, n, _, _ in chain])
-        chain_records.append({
-            'chain_id': chain_id,
-            'chain_length': len(chain),
-            'canonical_name': canonical_name or "N/A",
-            'should_apply': should_apply,
-            'reason': reason,
-            'name_diversity': round(diversity, 2) if diversity else 0,
-            'all_names': all_names
-        })
-
-        # Create mapping records
-        for year, tcpuid, original_name, cd_name, pr in chain:
-            mapping_records.append({
+    analyses = [find_canonical_name(chain, args.min_similarity) for chain in chains.values()]
+
+    # Mapping rows are streamed to CSV as they are produced; chains are
+    # numbered in order and sorted by year, so rows come out in (chain_id, year) order
+    with open(args.out_mapping, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(['chain_id', 'year', 'tcpuid', 'original_name', 'canonical_name',
+                         'should_apply', 'cd_name', 'province'])
+
+        for (chain_id, chain), analysis in zip(chains.items(), analyses):
+            canonical_name, should_apply, reason, diversity = analysis
+
+            # Record chain info
+            all_names = " | ".join([f"{y}:{n}" for y, _, n, _, _ in chain])
+            chain_records.append({
                 'chain_id': chain_id,
-                'year': year,
-                'tcpuid': tcpuid,
-                'original_name': original_name,
-                'canonical_name': canonical_name if should_apply else original_name,
+                'chain_length': len(chain),
+                'canonical_name': canonical_name or "N/A",
                 'should_apply': should_apply,
-                'cd_name': cd_name,
-                'province': pr
+                'reason': reason,
+                'name_diversity': round(diversity, 2) if diversity else 0,
+                'all_names': all_names
             })
 
-        if should_apply:
-            applied_count += 1
-        else:
-            skipped_count += 1
+            # Write mapping rows (missing values as empty fields, like to_csv)
+            for year, tcpuid, original_name, cd_name, pr in chain:
+                original_name, cd_name, pr = ("" if pd.isna(v) else v for v in (original_name, cd_name, pr))
+                writer.writerow([
+                    chain_id, year, tcpuid, original_name,
+                    canonical_name if should_apply else original_name,
+                    should_apply, cd_name, pr
+                ])
+                mapping_count += 1
+
+            if should_apply:
+                applied_count += 1
+            else:
+                skipped_count += 1
 
-    # Save results
-    if mapping_records:
-        df_mapping = pd.DataFrame(mapping_records)
-        df_mapping = df_mapping.sort_values(['chain_id', 'year'])
-        df_mapping.to_csv(args.out_mapping, index=False)
-        print(f"\n✓ Wrote {len(mapping_records)} mappings to {args.out_mapping}")
+    print(f"\n✓ Wrote {mapping_count} mappings to {args.out_mapping}")
 
     if chain_records:
         df_chains = pd.DataFrame(chain_records)
-        df_chains = df_chains.sort_values('chain_length', ascending=False)
+        df_chains.sort_values('chain_length', ascending=False, inplace=True)
         df_chains.to_csv(args.out_chains, index=False)
         print(f"✓ Wrote {len(chain_records)} chain summaries to {args.out_chains}")
 
@@ -302,7 +326,7 @@ def main():
     print(f"  Total chains: {len(chains)}")
     print(f"  Canonical names applied: {applied_count}")
     print(f"  Skipped (name changes): {skipped_count}")
-    print(f"  Total CSD-year records: {len(mapping_records)}")
+    print(f"  Total CSD-year records: {mapping_count}")
 
     # Show examples
     print(f"\nExample chains with canonical names applied:")
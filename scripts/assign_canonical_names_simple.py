@@ -9,14 +9,92 @@ For each TCPUID that appears across multiple years with IoU = 1.0:
 4. Apply canonical name only if names are similar
 """
 
+import numpy as np
 import pandas as pd
 import argparse
 from pathlib import Path
-from collections import Counter
-from rapidfuzz import fuzz
+from concurrent.futures import ThreadPoolExecutor
+from rapidfuzz import fuzz, process
 import sys
 
 
+def link_columns(year_from: int, year_to: int) -> list:
+    """Columns read from a link file for the FROM and TO sides of a year pair."""
+    return [
+        f'tcpuid_{year_from}', f'tcpuid_{year_to}',
+        f'csd_name_{year_from}', f'csd_name_{year_to}',
+        f'cd_name_{year_from}', f'cd_name_{year_to}',
+        f'pr_{year_from}', f'pr_{year_to}',
+    ]
+
+
+def load_same_as_links(links_dir: Path) -> list:
+    """
+    Load SAME_AS links with perfect spatial match (IoU = 1.0) from every link file.
+
+    Files are parsed concurrently; results keep year-pair order.
+
+    Returns:
+        List of ((year_from, year_to), DataFrame)
+    """
+    year_pairs = [
+        (1851, 1861), (1861, 1871), (1871, 1881), (1881, 1891),
+        (1891, 1901), (1901, 1911), (1911, 1921)
+    ]
+
+    link_files = []
+    for year_from, year_to in year_pairs:
+        # High-confidence links first, then ambiguous SAME_AS
+        for file_type in ['year_links', 'ambiguous']:
+            filepath = links_dir / f"{file_type}_{year_from}_{year_to}.csv"
+            if filepath.exists():
+                link_files.append((year_from, year_to, filepath))
+
+    def read_link_file(entry):
+        year_from, year_to, filepath = entry
+        columns = link_columns(year_from, year_to)
+        # Low-cardinality text columns are dictionary-encoded as categories
+        dtype = {'relationship': 'category', 'iou': 'float64'}
+        dtype.update({c: 'category' for c in columns if c.startswith(('cd_name_', 'pr_'))})
+        df = pd.read_csv(filepath, usecols=['relationship', 'iou'] + columns, dtype=dtype)
+        return df[(df['relationship'] == 'SAME_AS') & (df['iou'] >= 0.999)]
+
+    with ThreadPoolExecutor() as executor:
+        frames = list(executor.map(read_link_file, link_files))
+
+    return [((year_from, year_to), df) for (year_from, year_to, _), df in zip(link_files, frames)]
+
+
+def count_names(timeline_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Count how often each name occurs per TCPUID, working on integer codes.
+
+    timeline_df must be sorted by tcpuid, then year.
+
+    Returns:
+        DataFrame (tcpuid, original_name, count, first_seen) ordered by tcpuid,
+        then count descending, then first appearance, so the first row of each
+        TCPUID is its consensus name.
+    """
+    tcpuid_ids, tcpuid_values = pd.factorize(timeline_df['tcpuid'])
+    name_ids, name_values = pd.factorize(timeline_df['original_name'])
+    n_names = max(len(name_values), 1)
+
+    # One integer key per (tcpuid, name) pair
+    keys = tcpuid_ids.astype(np.int64) * n_names + name_ids
+    unique_keys, first_seen, counts = np.unique(keys, return_index=True, return_counts=True)
+    key_tcpuids = unique_keys // n_names
+    key_names = unique_keys % n_names
+
+    order = np.lexsort((first_seen, -counts, key_tcpuids))
+    return pd.DataFrame({
+        'tcpuid': tcpuid_values[key_tcpuids[order]],
+        'original_name': name_values[key_names[order]],
+        'count': counts[order],
+        'first_seen': first_seen[order],
+    })
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Assign canonical names based on temporal consensus"
@@ -29,127 +107,97 @@ def main():
 
     print("Loading all temporal links...", file=sys.stderr)
 
-    # Collect all CSD appearances across years
-    # Key: tcpuid, Value: list of (year, name, cd_name, pr)
-    csd_timeline = {}
+    # Collect all CSD appearances across years: each link contributes its FROM
+    # and TO side as (tcpuid, year, name, cd_name, province) rows
+    appearances = []
+    for (year_from, year_to), df in load_same_as_links(args.links_dir):
+        for year in (year_from, year_to):
+            side = df[[f'tcpuid_{year}', f'csd_name_{year}', f'cd_name_{year}', f'pr_{year}']]
+            side = side.set_axis(['tcpuid', 'original_name', 'cd_name', 'province'], axis=1)
+            appearances.append(side.assign(year=year))
+
+    # Keep the first appearance of each (tcpuid, year, name)
+    columns = ['tcpuid', 'year', 'original_name', 'cd_name', 'province']
+    timeline_df = (
+        pd.concat(appearances, ignore_index=True)[columns]
+        if appearances else pd.DataFrame(columns=columns)
+    )
+    timeline_df = timeline_df.drop_duplicates(['tcpuid', 'year', 'original_name'])
+    tcpuid_count = timeline_df['tcpuid'].nunique()
 
-    year_pairs = [
-        (1851, 1861), (1861, 1871), (1871, 1881), (1881, 1891),
-        (1891, 1901), (1901, 1911), (1911, 1921)
-    ]
-
-    for year_from, year_to in year_pairs:
-        # Process high-confidence SAME_AS links
-        for file_type in ['year_links', 'ambiguous']:
-            filepath = args.links_dir / f"{file_type}_{year_from}_{year_to}.csv"
-            if not filepath.exists():
-                continue
-
-            df = pd.read_csv(filepath)
-            df = df[(df['relationship'] == 'SAME_AS') & (df['iou'] >= 0.999)]
-
-            for _, row in df.iterrows():
-                tcpuid_from = row[f'tcpuid_{year_from}']
-                tcpuid_to = row[f'tcpuid_{year_to}']
-                name_from = row[f'csd_name_{year_from}']
-                name_to = row[f'csd_name_{year_to}']
-                cd_from = row[f'cd_name_{year_from}']
-                cd_to = row[f'cd_name_{year_to}']
-                pr_from = row[f'pr_{year_from}']
-                pr_to = row[f'pr_{year_to}']
-
-                # Add FROM appearance
-                if tcpuid_from not in csd_timeline:
-                    csd_timeline[tcpuid_from] = []
-                if (year_from, name_from) not in [(y, n) for y, n, _, _ in csd_timeline[tcpuid_from]]:
-                    csd_timeline[tcpuid_from].append((year_from, name_from, cd_from, pr_from))
-
-                # Add TO appearance
-                if tcpuid_to not in csd_timeline:
-                    csd_timeline[tcpuid_to] = []
-                if (year_to, name_to) not in [(y, n) for y, n, _, _ in csd_timeline[tcpuid_to]]:
-                    csd_timeline[tcpuid_to].append((year_to, name_to, cd_to, pr_to))
-
-    print(f"  Found {len(csd_timeline)} unique TCPUIDs with temporal data", file=sys.stderr)
+    print(f"  Found {tcpuid_count} unique TCPUIDs with temporal data", file=sys.stderr)
 
     # Analyze each TCPUID
     print("\nAnalyzing for canonical names...", file=sys.stderr)
 
-    results = []
-    applied = 0
-    skipped_single = 0
-    skipped_change = 0
-
-    for tcpuid, timeline in csd_timeline.items():
-        if len(timeline) < 2:
-            skipped_single += 1
-            continue
-
-        # Sort by year
-        timeline.sort()
-
-        names = [name for _, name, _, _ in timeline if name and pd.notna(name)]
-        if not names:
-            continue
-
-        # Find consensus name
-        name_counter = Counter(names)
-        canonical_name, consensus_count = name_counter.most_common(1)[0]
-
-        # Calculate similarity of all names to consensus
-        similarities = []
-        for name in set(names):
-            if name != canonical_name:
-                sim = fuzz.ratio(name.lower(), canonical_name.lower())
-                similarities.append(sim)
-
-        if not similarities:
-            # All names identical
-            avg_sim = 100.0
-            min_sim = 100.0
-            should_apply = True
-            reason = "unanimous"
-        else:
-            avg_sim = sum(similarities) / len(similarities)
-            min_sim = min(similarities)
-
-            # Apply canonical name if names are similar (OCR variants)
-            if avg_sim >= args.min_similarity and min_sim >= 60:
-                should_apply = True
-                reason = f"ocr_variants"
-                applied += 1
-            else:
-                should_apply = False
-                reason = f"name_change"
-                skipped_change += 1
-
-        # Create result record for each year
-        for year, name, cd_name, pr in timeline:
-            results.append({
-                'tcpuid': tcpuid,
-                'year': year,
-                'original_name': name,
-                'canonical_name': canonical_name if should_apply else name,
-                'should_apply': should_apply,
-                'consensus_count': consensus_count,
-                'total_years': len(timeline),
-                'avg_similarity': round(avg_sim, 1),
-                'min_similarity': round(min_sim, 1) if min_sim != 100 else 100,
-                'reason': reason,
-                'all_names': ' | '.join(sorted(set(names))),
-                'cd_name': cd_name,
-                'province': pr
-            })
+    # Timeline of each TCPUID sorted by year
+    timeline_df = timeline_df.sort_values(['tcpuid', 'year', 'original_name'], ignore_index=True)
+
+    timeline_df['total_years'] = timeline_df.groupby('tcpuid')['year'].transform('size')
+    skipped_single = timeline_df.loc[timeline_df['total_years'] < 2, 'tcpuid'].nunique()
+    timeline_df = timeline_df[timeline_df['total_years'] >= 2]
+
+    # Count each name per TCPUID; the consensus is the most common name,
+    # ties going to the one that appears first
+    named = timeline_df[timeline_df['original_name'].notna() & (timeline_df['original_name'] != '')]
+    name_counts = count_names(named)
+    consensus = (
+        name_counts.drop_duplicates('tcpuid')
+        .set_index('tcpuid')[['original_name', 'count']]
+        .rename(columns={'original_name': 'canonical_name', 'count': 'consensus_count'})
+    )
+    consensus['all_names'] = (
+        name_counts.sort_values(['tcpuid', 'original_name'])
+        .groupby('tcpuid')['original_name'].agg(' | '.join)
+    )
+
+    # Similarity of every variant to its consensus name, computed in C++ across all cores
+    variants = name_counts.join(consensus['canonical_name'], on='tcpuid')
+    variants = variants[variants['original_name'] != variants['canonical_name']]
+    scores = np.empty(len(variants))
+    if len(variants):
+        scores = process.cpdist(
+            variants['canonical_name'].str.lower().tolist(),
+            variants['original_name'].str.lower().tolist(),
+            scorer=fuzz.ratio, dtype=np.float64, workers=-1
+        )
+    variants = variants.assign(similarity=scores)
+    similarity = variants.groupby('tcpuid')['similarity'].agg(['mean', 'min'])
+    consensus['avg_similarity'] = similarity['mean'].reindex(consensus.index)
+    consensus['min_similarity'] = similarity['min'].reindex(consensus.index)
+
+    # Apply canonical name if all names are identical or similar (OCR variants)
+    unanimous = consensus['avg_similarity'].isna()
+    ocr_variants = (
+        ~unanimous
+        & (consensus['avg_similarity'] >= args.min_similarity)
+        & (consensus['min_similarity'] >= 60)
+    )
+    consensus['should_apply'] = unanimous | ocr_variants
+    consensus['reason'] = np.select(
+        [unanimous, ocr_variants], ['unanimous', 'ocr_variants'], default='name_change'
+    )
+    consensus['avg_similarity'] = consensus['avg_similarity'].fillna(100.0).round(1)
+    consensus['min_similarity'] = consensus['min_similarity'].fillna(100.0).round(1)
+    applied = int(ocr_variants.sum())
+    skipped_change = int((consensus['reason'] == 'name_change').sum())
+
+    # Create result record for each year of every analyzed TCPUID
+    df = timeline_df.join(consensus, on='tcpuid', how='inner')
+    df['canonical_name'] = df['canonical_name'].where(df['should_apply'], df['original_name'])
+    df = df[[
+        'tcpuid', 'year', 'original_name', 'canonical_name', 'should_apply',
+        'consensus_count', 'total_years', 'avg_similarity', 'min_similarity',
+        'reason', 'all_names', 'cd_name', 'province'
+    ]].astype({'year': 'int16', 'should_apply': 'bool', 'cd_name': 'category', 'province': 'category'})
 
     # Save results
-    if results:
-        df = pd.DataFrame(results)
-        df = df.sort_values(['tcpuid', 'year'])
+    if not df.empty:
         df.to_csv(args.out, index=False)
-        print(f"\n✓ Wrote {len(results)} records to {args.out}")
+        print(f"\n✓ Wrote {len(df)} records to {args.out}")
 
         print(f"\nSummary:")
-        print(f"  TCPUIDs analyzed: {len(csd_timeline)}")
+        print(f"  TCPUIDs analyzed: {tcpuid_count}")
         print(f"  Canonical names applied: {applied}")
         print(f"  Skipped (name changes): {skipped_change}")
         print(f"  Skipped (single year): {skipped_single}")
@@ -12,72 +12,136 @@ Date: October 1, 2025
 """
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import pyogrio
+import shapely
 from pathlib import Path
 import argparse
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from typing import List, Dict, Set, Tuple
 
 
-def load_gdb_cd_layer(gdb_path: str, year: int) -> gpd.GeoDataFrame:
+def write_csv(df: pd.DataFrame, path: Path, admin_import: bool = False) -> None:
     """
-    Load Census Division layer from GDB for a specific year.
+    Write a Neo4j import CSV; all outputs go through here.
 
-    CDs are aggregated from CSDs, so we need to extract unique CD geometries
-    from the CSD layer by dissolving on CD identifiers.
+    With admin_import, write a header-only <stem>_header.csv plus headerless
+    gzipped <stem>.csv.gz data for neo4j-admin database import instead.
     """
-    print(f"  Loading GDB layer for {year}...", file=sys.stderr)
+    if admin_import:
+        df.head(0).to_csv(path.with_name(f'{path.stem}_header.csv'), index=False)
+        df.to_csv(path.with_name(f'{path.name}.gz'), index=False, header=False, compression='gzip')
+    else:
+        df.to_csv(path, index=False)
+
 
-    # Load CSD layer (use V2T2 for 1911)
+def constant_column(value: str, length: int) -> pd.Categorical:
+    """Repeat a constant label or type as a one-category Categorical (1 byte per row)."""
+    return pd.Categorical.from_codes(np.zeros(length, dtype=np.int8), categories=[value])
+
+
+def read_csd_layer(gdb_path: str, year: int) -> gpd.GeoDataFrame:
+    """
+    Read the CSD layer for a year with only the columns this script needs.
+
+    Column names carry year suffixes (e.g. Name_CD_1851), so they are
+    discovered from the layer schema first and then the read is limited to
+    CD name, province and TCPUID plus geometry. Returns a GeoDataFrame with
+    columns cd_name, pr, tcpuid and geometry.
+    """
+    # Use V2T2 for 1911
     if year == 1911:
         layer_name = f'CANADA_{year}_CSD_V2T2'
     else:
         layer_name = f'CANADA_{year}_CSD'
-    gdf = gpd.read_file(gdb_path, layer=layer_name)
 
-    # Standardize column names (columns have year suffixes like Name_CD_1851)
-    cd_col = [col for col in gdf.columns if 'NAME_CD' in col.upper() and 'CSD' not in col.upper()][0]
-    pr_col = [col for col in gdf.columns if col.startswith('PR') or col.startswith('pr')][0]
+    fields = list(pyogrio.read_info(gdb_path, layer=layer_name)['fields'])
+    cd_cols = [col for col in fields if 'NAME_CD' in col.upper() and 'CSD' not in col.upper()]
+    pr_cols = [col for col in fields if col.startswith('PR') or col.startswith('pr')]
+    # TCPUID column name varies by year, V2T2 uses V2t2_UID
+    tcpuid_cols = [col for col in fields if 'TCPUID' in col.upper() or 'V2T2_UID' in col.upper()]
+    if not cd_cols or not pr_cols or not tcpuid_cols:
+        raise ValueError(f"Missing CD name, PR or TCPUID column in {year}. Columns: {fields}")
+    cd_col, pr_col, tcpuid_col = cd_cols[0], pr_cols[0], tcpuid_cols[0]
 
-    gdf = gdf.rename(columns={cd_col: 'cd_name', pr_col: 'pr'})
+    gdf = gpd.read_file(gdb_path, layer=layer_name, columns=[cd_col, pr_col, tcpuid_col])
+    return gdf.rename(columns={cd_col: 'cd_name', pr_col: 'pr', tcpuid_col: 'tcpuid'})
 
-    # Check required columns
-    required = ['cd_name', 'pr', 'geometry']
-    missing = [col for col in required if col not in gdf.columns]
-    if missing:
-        raise ValueError(f"Missing columns in {year}: {missing}")
 
-    # Fix invalid geometries before dissolving
-    gdf['geometry'] = gdf['geometry'].buffer(0)
+def is_valid_cd_coverage(gdf: gpd.GeoDataFrame) -> bool:
+    """
+    True if the CSDs of every CD form a valid polygonal coverage.
 
-    # Dissolve CSDs to create CD polygons
-    print(f"  Dissolving {len(gdf)} CSDs into CD polygons...", file=sys.stderr)
+    A valid coverage has no overlaps and matching shared edges, which is
+    what the coverage union assumes. Needs shapely >= 2.1; with older
+    versions, or geometries the check cannot handle, this returns False so
+    callers fall back to a unary union.
+    """
+    if not hasattr(shapely, 'coverage_is_valid'):
+        return False
+    geoms = gdf.geometry.values.to_numpy()
     try:
-        cd_gdf = gdf.dissolve(by=['cd_name', 'pr'], as_index=False)
-    except Exception as e:
-        print(f"  Warning: Dissolve failed, trying with make_valid...", file=sys.stderr)
-        gdf['geometry'] = gdf['geometry'].make_valid()
+        return all(
+            shapely.coverage_is_valid(geoms[idx])
+            for idx in gdf.groupby(['cd_name', 'pr']).indices.values()
+        )
+    except Exception:
+        return False
+
+
+def load_gdb_cd_layer(gdb_path: str, year: int) -> Tuple[pd.DataFrame, gpd.GeoDataFrame]:
+    """
+    Load Census Division layer from GDB for a specific year.
+
+    CDs are aggregated from CSDs, so we need to extract unique CD geometries
+    from the CSD layer by dissolving on CD identifiers. The layer is read
+    once; the CSD attributes (without geometry) are returned alongside the
+    dissolved CDs for the P10 relationships.
+    """
+    print(f"  Loading GDB layer for {year}...", file=sys.stderr)
+    gdf = read_csd_layer(gdb_path, year)
+
+    # Repair only the geometries that need it; most CSDs are already valid
+    invalid_mask = ~gdf.geometry.is_valid
+    if invalid_mask.any():
+        print(f"  Repairing {invalid_mask.sum()} invalid CSD geometries...", file=sys.stderr)
+        gdf.loc[invalid_mask, 'geometry'] = gdf.loc[invalid_mask, 'geometry'].make_valid()
+
+    # Dissolve CSDs to create CD polygons. The coverage union (geopandas >=
+    # 1.0) is much cheaper than a unary union, but returns wrong geometry
+    # without raising when CSDs overlap or do not share edges exactly, so it
+    # is only used once the input has been checked.
+    print(f"  Dissolving {len(gdf)} CSDs into CD polygons...", file=sys.stderr)
+    if is_valid_cd_coverage(gdf):
+        cd_gdf = gdf.dissolve(by=['cd_name', 'pr'], as_index=False, method='coverage')
+    else:
+        print(f"  CSDs do not form a clean coverage, using a unary dissolve...", file=sys.stderr)
         cd_gdf = gdf.dissolve(by=['cd_name', 'pr'], as_index=False)
 
     # Calculate area in square meters (use projected CRS for accuracy)
     cd_gdf_proj = cd_gdf.to_crs('EPSG:3347')  # Statistics Canada Lambert
     cd_gdf['area'] = cd_gdf_proj.geometry.area
 
-    # Calculate centroids (in WGS84 for lat/lon)
-    cd_gdf_wgs84 = cd_gdf.to_crs('EPSG:4326')
-    centroids = cd_gdf_wgs84.geometry.centroid
+    # Calculate centroids in the projected CRS and reproject only the points
+    centroids = cd_gdf_proj.geometry.centroid.to_crs('EPSG:4326')
     cd_gdf['centroid_lat'] = centroids.y
     cd_gdf['centroid_lon'] = centroids.x
 
     # Count CSDs per CD
-    csd_counts = gdf.groupby(['cd_name', 'pr']).size().reset_index(name='num_csds')
+    csd_counts = gdf[['cd_name', 'pr']].groupby(['cd_name', 'pr']).size().reset_index(name='num_csds')
     cd_gdf = cd_gdf.merge(csd_counts, on=['cd_name', 'pr'])
 
     # Create CD identifier (matches E53_Place ID format)
     cd_gdf['cd_id'] = 'CD_' + cd_gdf['pr'] + '_' + cd_gdf['cd_name'].str.replace(' ', '_')
+    cd_gdf['presence_id'] = cd_gdf['cd_id'] + f'_{year}'
 
     print(f"  ✓ Found {len(cd_gdf)} unique CDs", file=sys.stderr)
-    return cd_gdf
+    csd_df = pd.DataFrame(gdf.drop(columns='geometry'))
+    return csd_df, cd_gdf
 
 
 def extract_e93_cd_presences(gdf: gpd.GeoDataFrame, year: int) -> pd.DataFrame:
@@ -87,12 +151,12 @@ def extract_e93_cd_presences(gdf: gpd.GeoDataFrame, year: int) -> pd.DataFrame:
     print(f"  Creating E93_Presence (CD) nodes for {year}...", file=sys.stderr)
 
     presences = pd.DataFrame({
-        'presence_id:ID': gdf['cd_id'] + f'_{year}',
+        'presence_id:ID': gdf['presence_id'],
         'cd_id': gdf['cd_id'],
         'census_year:int': year,
         'area_sqm:float': gdf['area'].round(2),
         'num_csds:int': gdf['num_csds'],
-        ':LABEL': 'E93_Presence'
+        ':LABEL': constant_column('E93_Presence', len(gdf))
     })
 
     return presences
@@ -105,11 +169,11 @@ def extract_e94_cd_space_primitives(gdf: gpd.GeoDataFrame, year: int) -> pd.Data
     print(f"  Creating E94_Space_Primitive (CD) nodes for {year}...", file=sys.stderr)
 
     space_primitives = pd.DataFrame({
-        'space_id:ID': gdf['cd_id'] + f'_{year}_SPACE',
+        'space_id:ID': gdf['presence_id'] + '_SPACE',
         'latitude:float': gdf['centroid_lat'].round(6),
         'longitude:float': gdf['centroid_lon'].round(6),
         'crs': 'EPSG:4326',
-        ':LABEL': 'E94_Space_Primitive'
+        ':LABEL': constant_column('E94_Space_Primitive', len(gdf))
     })
 
     return space_primitives
@@ -122,9 +186,9 @@ def extract_p166_cd_was_presence_of(gdf: gpd.GeoDataFrame, year: int) -> pd.Data
     print(f"  Creating P166_was_a_presence_of (CD) relationships...", file=sys.stderr)
 
     relationships = pd.DataFrame({
-        ':START_ID': gdf['cd_id'] + f'_{year}',  # presence_id
+        ':START_ID': gdf['presence_id'],
         ':END_ID': gdf['cd_id'],  # place_id (CD)
-        ':TYPE': 'P166_was_a_presence_of'
+        ':TYPE': constant_column('P166_was_a_presence_of', len(gdf))
     })
 
     return relationships
@@ -137,9 +201,9 @@ def extract_p164_cd_temporally_specified_by(gdf: gpd.GeoDataFrame, year: int) ->
     print(f"  Creating P164_is_temporally_specified_by (CD) relationships...", file=sys.stderr)
 
     relationships = pd.DataFrame({
-        ':START_ID': gdf['cd_id'] + f'_{year}',
+        ':START_ID': gdf['presence_id'],
         ':END_ID': f'CENSUS_{year}',
-        ':TYPE': 'P164_is_temporally_specified_by'
+        ':TYPE': constant_column('P164_is_temporally_specified_by', len(gdf))
     })
 
     return relationships
@@ -152,15 +216,15 @@ def extract_p161_cd_spatial_projection(gdf: gpd.GeoDataFrame, year: int) -> pd.D
     print(f"  Creating P161_has_spatial_projection (CD) relationships...", file=sys.stderr)
 
     relationships = pd.DataFrame({
-        ':START_ID': gdf['cd_id'] + f'_{year}',
-        ':END_ID': gdf['cd_id'] + f'_{year}_SPACE',
-        ':TYPE': 'P161_has_spatial_projection'
+        ':START_ID': gdf['presence_id'],
+        ':END_ID': gdf['presence_id'] + '_SPACE',
+        ':TYPE': constant_column('P161_has_spatial_projection', len(gdf))
     })
 
     return relationships
 
 
-def extract_p10_csd_within_cd(csd_gdf: gpd.GeoDataFrame, cd_gdf: gpd.GeoDataFrame, year: int) -> pd.DataFrame:
+def extract_p10_csd_within_cd(csd_df: pd.DataFrame, cd_gdf: gpd.GeoDataFrame, year: int) -> pd.DataFrame:
     """
     P10_falls_within: E93_Presence (CSD) -> E93_Presence (CD)
 
@@ -168,15 +232,14 @@ def extract_p10_csd_within_cd(csd_gdf: gpd.GeoDataFrame, cd_gdf: gpd.GeoDataFram
     """
     print(f"  Creating P10_falls_within (CSD presence → CD presence) relationships...", file=sys.stderr)
 
-    # Add CD identifiers to CSD dataframe
-    csd_gdf = csd_gdf.copy()
-    csd_gdf['cd_id'] = 'CD_' + csd_gdf['pr'] + '_' + csd_gdf['cd_name'].str.replace(' ', '_')
+    # Look up each CSD's CD presence from the dissolved CDs
+    csd_df = csd_df.merge(cd_gdf[['cd_name', 'pr', 'presence_id']], on=['cd_name', 'pr'], how='left')
 
     relationships = pd.DataFrame({
-        ':START_ID': csd_gdf['tcpuid'] + f'_{year}',  # CSD presence
-        ':END_ID': csd_gdf['cd_id'] + f'_{year}',  # CD presence
+        ':START_ID': csd_df['tcpuid'] + f'_{year}',  # CSD presence
+        ':END_ID': csd_df['presence_id'],  # CD presence
         'during_period': f'CENSUS_{year}',
-        ':TYPE': 'P10_falls_within'
+        ':TYPE': constant_column('P10_falls_within', len(csd_df))
     })
 
     return relationships
@@ -201,54 +264,39 @@ def load_cd_temporal_links(links_dir: Path) -> pd.DataFrame:
             df = pd.read_csv(link_file)
 
             # Filter for high-confidence links
-            suitable = df[df['relationship'].isin(['SAME_AS', 'CONTAINS', 'WITHIN'])].copy()
-
-            for _, row in suitable.iterrows():
-                all_links.append({
-                    ':START_ID': row['cd_from'] + f'_{year_from}',
-                    ':END_ID': row['cd_to'] + f'_{year_to}',
-                    'overlap_type': row['relationship'],
-                    'iou:float': row['iou'],
-                    'from_fraction:float': row['from_fraction'],
-                    'to_fraction:float': row['to_fraction'],
-                    'year_from:int': year_from,
-                    'year_to:int': year_to,
-                    ':TYPE': 'P132_spatiotemporally_overlaps_with'
-                })
-
-    return pd.DataFrame(all_links)
-
-
-def process_year(gdb_path: str, year: int, out_dir: Path) -> Tuple[gpd.GeoDataFrame, Dict[str, int]]:
+            suitable = df[df['relationship'].isin(['SAME_AS', 'CONTAINS', 'WITHIN'])]
+
+            all_links.append(pd.DataFrame({
+                ':START_ID': suitable['cd_from'] + f'_{year_from}',
+                ':END_ID': suitable['cd_to'] + f'_{year_to}',
+                'overlap_type': suitable['relationship'],
+                'iou:float': suitable['iou'],
+                'from_fraction:float': suitable['from_fraction'],
+                'to_fraction:float': suitable['to_fraction'],
+                'year_from:int': year_from,
+                'year_to:int': year_to,
+                ':TYPE': constant_column('P132_spatiotemporally_overlaps_with', len(suitable))
+            }))
+
+    if not all_links:
+        return pd.DataFrame()
+    return pd.concat(all_links, ignore_index=True)
+
+
+def process_year(gdb_path: str, year: int, out_dir: Path,
+                 admin_import: bool = False) -> Tuple[Set[str], Dict[str, int]]:
     """
     Process a single census year for CD presences.
+
+    Runs in a worker process, so only the CD IDs and counts are returned
+    rather than the dissolved geometries.
     """
     print(f"\n{'='*60}", file=sys.stderr)
     print(f"Processing {year}", file=sys.stderr)
     print(f"{'='*60}", file=sys.stderr)
 
-    # Load CD geometries
-    cd_gdf = load_gdb_cd_layer(gdb_path, year)
-
-    # Also load CSD layer for P10 relationships (use V2T2 for 1911)
-    if year == 1911:
-        layer_name = f'CANADA_{year}_CSD_V2T2'
-    else:
-        layer_name = f'CANADA_{year}_CSD'
-    csd_gdf = gpd.read_file(gdb_path, layer=layer_name)
-
-    # Standardize CSD column names (columns have year suffixes like Name_CD_1851)
-    cd_col = [col for col in csd_gdf.columns if 'NAME_CD' in col.upper() and 'CSD' not in col.upper()][0]
-    pr_col = [col for col in csd_gdf.columns if col.startswith('PR') or col.startswith('pr')][0]
-
-    csd_gdf = csd_gdf.rename(columns={cd_col: 'cd_name', pr_col: 'pr'})
-
-    # Get TCPUID column name (varies by year, V2T2 uses V2t2_UID)
-    tcpuid_cols = [col for col in csd_gdf.columns if 'TCPUID' in col.upper() or 'V2T2_UID' in col.upper()]
-    if not tcpuid_cols:
-        raise ValueError(f"Could not find TCPUID column in {year}. Columns: {list(csd_gdf.columns)}")
-    tcpuid_col = tcpuid_cols[0]
-    csd_gdf['tcpuid'] = csd_gdf[tcpuid_col]
+    # Load CD geometries and the CSD attributes for P10 relationships
+    csd_df, cd_gdf = load_gdb_cd_layer(gdb_path, year)
 
     # Extract nodes
     presences = extract_e93_cd_presences(cd_gdf, year)
@@ -258,15 +306,15 @@ def process_year(gdb_path: str, year: int, out_dir: Path) -> Tuple[gpd.GeoDataFr
     p166 = extract_p166_cd_was_presence_of(cd_gdf, year)
     p164 = extract_p164_cd_temporally_specified_by(cd_gdf, year)
     p161 = extract_p161_cd_spatial_projection(cd_gdf, year)
-    p10 = extract_p10_csd_within_cd(csd_gdf, cd_gdf, year)
+    p10 = extract_p10_csd_within_cd(csd_df, cd_gdf, year)
 
     # Write files
-    presences.to_csv(out_dir / f'e93_presence_cd_{year}.csv', index=False)
-    space_prims.to_csv(out_dir / f'e94_space_primitive_cd_{year}.csv', index=False)
-    p166.to_csv(out_dir / f'p166_was_presence_of_cd_{year}.csv', index=False)
-    p164.to_csv(out_dir / f'p164_temporally_specified_by_cd_{year}.csv', index=False)
-    p161.to_csv(out_dir / f'p161_spatial_projection_cd_{year}.csv', index=False)
-    p10.to_csv(out_dir / f'p10_csd_within_cd_presence_{year}.csv', index=False)
+    write_csv(presences, out_dir / f'e93_presence_cd_{year}.csv', admin_import)
+    write_csv(space_prims, out_dir / f'e94_space_primitive_cd_{year}.csv', admin_import)
+    write_csv(p166, out_dir / f'p166_was_presence_of_cd_{year}.csv', admin_import)
+    write_csv(p164, out_dir / f'p164_temporally_specified_by_cd_{year}.csv', admin_import)
+    write_csv(p161, out_dir / f'p161_spatial_projection_cd_{year}.csv', admin_import)
+    write_csv(p10, out_dir / f'p10_csd_within_cd_presence_{year}.csv', admin_import)
 
     print(f"\n✓ Wrote {len(presences)} E93_Presence (CD) nodes")
     print(f"✓ Wrote {len(space_prims)} E94_Space_Primitive (CD) nodes")
@@ -284,7 +332,7 @@ def process_year(gdb_path: str, year: int, out_dir: Path) -> Tuple[gpd.GeoDataFr
         'p10': len(p10)
     }
 
-    return cd_gdf, stats
+    return set(cd_gdf['cd_id'].unique()), stats
 
 
 def main():
@@ -293,6 +341,8 @@ def main():
     parser.add_argument('--years', required=True, help='Comma-separated years (e.g., 1851,1861,1871)')
     parser.add_argument('--cd-links', default='cd_links_output', help='CD temporal links directory')
     parser.add_argument('--out', required=True, help='Output directory for CSV files')
+    parser.add_argument('--admin-import', action='store_true',
+                        help='Write header files and gzipped data for neo4j-admin database import')
     args = parser.parse_args()
 
     # Parse years
@@ -321,11 +371,15 @@ def main():
 
     all_cd_ids = set()
 
-    for year in years:
-        cd_gdf, stats = process_year(args.gdb, year, out_dir)
+    # Years are independent (own GDB layer, own output files), so run them in parallel
+    with ProcessPoolExecutor(max_workers=min(len(years), os.cpu_count() or 1)) as executor:
+        worker = partial(process_year, args.gdb, out_dir=out_dir, admin_import=args.admin_import)
+        results = list(executor.map(worker, years))
+
+    for cd_ids, stats in results:
         for key in total_stats:
             total_stats[key] += stats[key]
-        all_cd_ids.update(cd_gdf['cd_id'].unique())
+        all_cd_ids.update(cd_ids)
 
     # Load and export P132 temporal overlap relationships
     print(f"\n{'='*60}", file=sys.stderr)
@@ -336,7 +390,7 @@ def main():
     cd_temporal_links = load_cd_temporal_links(links_dir)
 
     if len(cd_temporal_links) > 0:
-        cd_temporal_links.to_csv(out_dir / 'p132_spatiotemporally_overlaps_with_cd.csv', index=False)
+        write_csv(cd_temporal_links, out_dir / 'p132_spatiotemporally_overlaps_with_cd.csv', args.admin_import)
         print(f"\n✓ CD P132 relationships: {len(cd_temporal_links)}", file=sys.stderr)
 
         # Summary by relationship type
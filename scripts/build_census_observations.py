@@ -12,61 +12,132 @@ Date: September 30, 2025
 """
 
 import argparse
+import os
+import numpy as np
 import pandas as pd
-import geopandas as gpd
+import pyogrio
 from pathlib import Path
 import sys
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import functools
 import re
 
+from pickle_cache import read_excel_cached
 
+
+# Year suffix on table column names (e.g. POP_TOTAL_1901)
+_YEAR_RE = re.compile(r'_\d{4}$')
+
+# (pattern, unit) checked in order against the upper-cased variable name
+UNIT_PATTERNS = [
+    (re.compile(r'POP|AGE_|RELIGION|BIRTH|LANG|RACE|OCCUPATION'), 'persons'),
+    (re.compile(r'ACRES'), 'acres'),
+    (re.compile(r'SQ_?MI'), 'square_miles'),
+    (re.compile(r'BUSHEL'), 'bushels'),
+    (re.compile(r'DOLLAR|VALUE'), 'dollars'),
+    (re.compile(r'TON'), 'tons'),
+    (re.compile(r'HEAD|LIVESTOCK|CATTLE'), 'head'),
+    (re.compile(r'FARM.*COUNT|COUNT.*FARM'), 'farms'),
+    (re.compile(r'PERCENT|PCT'), 'percent'),
+]
+
+
+@functools.lru_cache(maxsize=None)
 def infer_unit(variable_name):
     """Infer measurement unit from variable name."""
     name_upper = variable_name.upper()
 
-    if any(x in name_upper for x in ['POP', 'AGE_', 'RELIGION', 'BIRTH', 'LANG', 'RACE', 'OCCUPATION']):
-        return 'persons'
-    elif 'ACRES' in name_upper:
-        return 'acres'
-    elif 'SQ_MI' in name_upper or 'SQMI' in name_upper:
-        return 'square_miles'
-    elif 'BUSHEL' in name_upper:
-        return 'bushels'
-    elif 'DOLLAR' in name_upper or 'VALUE' in name_upper:
-        return 'dollars'
-    elif 'TON' in name_upper:
-        return 'tons'
-    elif 'HEAD' in name_upper or 'LIVESTOCK' in name_upper or 'CATTLE' in name_upper:
-        return 'head'
-    elif 'FARM' in name_upper and 'COUNT' in name_upper:
-        return 'farms'
-    elif 'PERCENT' in name_upper or 'PCT' in name_upper:
-        return 'percent'
+    for pattern, unit in UNIT_PATTERNS:
+        if pattern.search(name_upper):
+            return unit
+    return 'unknown'
+
+
+def write_csv(df, path, admin_import=False, columns=None):
+    """
+    Write a Neo4j import CSV; all outputs go through here.
+
+    Args:
+        df: DataFrame to write
+        path: Output path (e.g. e13_observations_1901.csv)
+        admin_import: Instead of one LOAD CSV file, write a header-only
+            <stem>_header.csv and headerless gzipped <stem>.csv.gz data
+            for neo4j-admin database import
+        columns: Optional {df column: CSV header} mapping; writes only
+            those columns, in that order, without building a new frame
+    """
+    if columns is None:
+        columns = dict(zip(df.columns, df.columns))
+    subset = list(columns)
+    header = list(columns.values())
+    if admin_import:
+        df.head(0).to_csv(path.with_name(f'{path.stem}_header.csv'), index=False,
+                          columns=subset, header=header)
+        df.to_csv(path.with_name(f'{path.name}.gz'), index=False, columns=subset,
+                  header=False, compression='gzip')
     else:
-        return 'unknown'
+        df.to_csv(path, index=False, columns=subset, header=header)
 
 
-def load_master_variables(mastvar_path):
+def constant_column(value, length):
+    """Repeat a constant :LABEL/:TYPE value as a one-category Categorical (1 byte per row)."""
+    return pd.Categorical.from_codes(np.zeros(length, dtype=np.int8), categories=[value])
+
+
+def load_master_variables(mastvar_path, cache_dir=None):
     """
     Load master variables file to understand variable definitions.
 
+    Args:
+        mastvar_path: Path to the master variables workbook
+        cache_dir: Optional directory for cached workbook parses
+
     Returns:
         DataFrame with columns: Name, Description, Category, {years}
     """
     print(f"Loading master variables from {mastvar_path}...")
-    df = pd.read_excel(mastvar_path)
+    df = read_excel_cached(mastvar_path, cache_dir=cache_dir)
     print(f"  Found {len(df)} variable definitions")
     print(f"  Categories: {df['Category'].unique().tolist()}")
     return df
 
 
-def create_variable_types(mastvar_df, output_dir):
+def build_variable_lookup(mastvar_df):
+    """
+    Build a variable name -> category lookup from the master variables.
+
+    The first definition wins when a name appears more than once.
+    """
+    lookup = {}
+    for name, category in zip(mastvar_df['Name'], mastvar_df['Category']):
+        lookup.setdefault(name, category)
+    return lookup
+
+
+# Variable name -> category lookup for worker processes, set by init_worker
+_VAR_LOOKUP = {}
+
+
+def init_worker(var_lookup):
+    """
+    ProcessPoolExecutor initializer: store the variable lookup once per worker.
+
+    Args:
+        var_lookup: Variable name -> category dict from build_variable_lookup
+    """
+    global _VAR_LOOKUP
+    _VAR_LOOKUP = var_lookup
+
+
+def create_variable_types(mastvar_df, output_dir, admin_import=False):
     """
     Create E55_Type nodes for all variables.
 
     Args:
         mastvar_df: DataFrame from master variables file
         output_dir: Output directory for CSV files
+        admin_import: Write neo4j-admin header files and gzipped data
     """
     print("\nCreating E55_Type variable taxonomy...")
 
@@ -85,7 +156,7 @@ def create_variable_types(mastvar_df, output_dir):
     # Create output DataFrame
     df = pd.DataFrame(variable_types)
     output_path = output_dir / 'e55_variable_types.csv'
-    df.to_csv(output_path, index=False)
+    write_csv(df, output_path, admin_import)
     print(f"  Created {len(df)} variable types → {output_path}")
 
     return df
@@ -103,53 +174,60 @@ def load_gdb_layer(gdb_path, year):
         year: Census year (e.g., 1901)
 
     Returns:
-        tuple: (GeoDataFrame with TCPUID, id_column_name)
+        tuple: (DataFrame with TCPUID column only, id_column_name)
     """
     layer_name = f"CANADA_{year}_CSD"
 
     print(f"\n  Loading GDB layer: {layer_name}")
 
     try:
-        gdf = gpd.read_file(gdb_path, layer=layer_name)
+        fields = list(pyogrio.read_info(gdb_path, layer=layer_name)['fields'])
     except Exception as e:
         print(f"    ERROR loading layer: {e}")
         return None, None
 
-    print(f"    Features: {len(gdf)}")
-
     # Find TCPUID column
     tcpuid_col = f"TCPUID_CSD_{year}"
-    if tcpuid_col not in gdf.columns:
+    if tcpuid_col not in fields:
         print(f"    ERROR: {tcpuid_col} not found")
-        print(f"    Columns: {gdf.columns.tolist()}")
+        print(f"    Columns: {fields}")
         return None, None
 
     print(f"    Using ID column: {tcpuid_col}")
 
-    # Return just the TCPUID column
-    return gdf[[tcpuid_col]], tcpuid_col
+    # Read just the TCPUID column; geometry is never needed here
+    try:
+        df = pyogrio.read_dataframe(gdb_path, layer=layer_name, columns=[tcpuid_col], read_geometry=False)
+    except Exception as e:
+        print(f"    ERROR loading layer: {e}")
+        return None, None
 
+    print(f"    Features: {len(df)}")
+    return df, tcpuid_col
 
+
+@functools.lru_cache(maxsize=None)
 def normalize_column_name(col):
     """Normalize column name by removing year suffix."""
     # Remove _1911, _1901, etc. suffixes
-    return re.sub(r'_\d{4}$', '', col)
+    return _YEAR_RE.sub('', col)
 
 
-def process_census_table(table_path, year, gdf_mapping, id_col_name, mastvar_df, source_name):
+def process_census_table(table_path, year, valid_ids, var_lookup, source_name, cache_dir=None):
     """
     Process a single census table and create observations.
 
     Args:
         table_path: Path to Excel file
         year: Census year
-        gdf_mapping: GeoDataFrame with TCPUID column
-        id_col_name: Name of ID column in GDB (e.g., 'TCPUID_CSD_1901')
-        mastvar_df: Master variables DataFrame
+        valid_ids: Set of TCPUIDs present in the year's GDB layer (or None
+            to skip validation)
+        var_lookup: Variable name -> category dict from build_variable_lookup
         source_name: Source table identifier (e.g., 'V1T1')
+        cache_dir: Optional directory for cached workbook parses
 
     Returns:
-        List of observation dictionaries
+        DataFrame of observations, one row per non-null cell
     """
     print(f"\n  Processing {table_path.name}...")
 
@@ -157,15 +235,15 @@ def process_census_table(table_path, year, gdf_mapping, id_col_name, mastvar_df,
     df = None
     try:
         # Try without skipping (1851-1901 format)
-        df = pd.read_excel(table_path)
+        df = read_excel_cached(table_path, cache_dir=cache_dir)
 
         # Check if we have TCPUID column - if not, try skipping rows
         if f'TCPUID_CSD_{year}' not in df.columns:
-            df = pd.read_excel(table_path, skiprows=3)
+            df = read_excel_cached(table_path, skiprows=3, cache_dir=cache_dir)
 
     except Exception as e:
         print(f"    ERROR reading file: {e}")
-        return []
+        return pd.DataFrame()
 
     # Find ID column - try multiple patterns
     id_col = None
@@ -186,7 +264,7 @@ def process_census_table(table_path, year, gdf_mapping, id_col_name, mastvar_df,
         print(f"    ERROR: Could not find ID column")
         print(f"    Looking for: TCPUID_CSD_{year} or {source_name}_{year}")
         print(f"    Columns: {df.columns.tolist()[:15]}")
-        return []
+        return pd.DataFrame()
 
     print(f"    Using ID column: {id_col}")
     print(f"    Processing {len(df)} rows...")
@@ -200,75 +278,65 @@ def process_census_table(table_path, year, gdf_mapping, id_col_name, mastvar_df,
     data_cols = [col for col in df.columns if col not in metadata_cols]
     print(f"    Found {len(data_cols)} data columns")
 
-    observations = []
-    rows_processed = 0
-
-    for idx, row in df.iterrows():
-        csd_table_id = row[id_col]
-
-        # Skip invalid rows
-        if pd.isna(csd_table_id):
-            continue
-
-            # For 1851-1901, the table ID (e.g., ON001001) IS the TCPUID
-        # Validate it exists in GDB layer
-        if gdf_mapping is not None:
-            match = gdf_mapping[gdf_mapping[id_col_name] == csd_table_id]
-            if len(match) == 0:
-                continue  # Skip if ID not in GDB layer
-
-        tcpuid = csd_table_id
-
-        # Create observations for each non-null variable
-        for col in data_cols:
-            value = row[col]
-
-            # Skip null values
-            if pd.isna(value):
-                continue
-
-            # Normalize column name
-            var_name_normalized = normalize_column_name(col)
-
-            # Determine value type
-            if isinstance(value, (int, float)):
-                value_numeric = float(value)
-                value_string = None
-            else:
-                value_numeric = None
-                value_string = str(value)
-
-            # Look up variable metadata from master variables
-            var_info = mastvar_df[mastvar_df['Name'] == var_name_normalized]
-            if len(var_info) > 0:
-                category = var_info.iloc[0]['Category']
-                description = var_info.iloc[0]['Description']
-            else:
-                category = 'UNKNOWN'
-                description = col
-
-            # Create observation
-            obs = {
-                'observation_id': f"{tcpuid}_{year}_{var_name_normalized}",
-                'variable_name': var_name_normalized,
-                'variable_category': category,
-                'value_numeric': value_numeric,
-                'value_string': value_string,
-                'unit': infer_unit(var_name_normalized),
-                'source_table': source_name,
-                'presence_id': f"{tcpuid}_{year}",
-                'period_id': f"CENSUS_{year}",
-                'variable_type_id': f"VAR_{var_name_normalized}"
-            }
-            observations.append(obs)
-
-        rows_processed += 1
+    # Keep rows with an ID; for 1851-1901 the table ID (e.g., ON001001) IS
+    # the TCPUID, so validate it exists in the GDB layer
+    df = df[df[id_col].notna()]
+    if valid_ids is not None:
+        df = df[df[id_col].isin(valid_ids)]
+    rows_processed = len(df)
+
+    # One row per non-null cell in row-major (CSD, then column) order:
+    # flattening the value block in C order gives that order directly, and
+    # each cell carries an integer code for its column instead of the name
+    n_cols = len(data_cols)
+    values = df[data_cols].to_numpy().ravel()
+    keep = ~pd.isna(values)
+    values = values[keep]
+    ids = df[id_col].to_numpy().repeat(n_cols)[keep]
+
+    # Normalize column names by removing year suffix; several columns can
+    # share a variable name, so factorize to one code per variable name
+    col_codes, var_names = pd.factorize(pd.Index([normalize_column_name(str(col)) for col in data_cols]))
+    codes = np.tile(col_codes, len(df))[keep]
+
+    # Look up variable category from master variables
+    # and infer units, once per distinct variable name
+    var_names = var_names.to_numpy(dtype=object)
+    categories = np.array([var_lookup.get(name, 'UNKNOWN') for name in var_names], dtype=object)
+    units = np.array([infer_unit(name) for name in var_names], dtype=object)
+    variable_name = pd.Series(var_names[codes], dtype=object)
+
+    # Determine value type once per column: numbers go to value_numeric,
+    # anything else to value_string (only those cells are stringified)
+    numeric = (
+        df[data_cols].apply(pd.to_numeric, errors='coerce')
+        .to_numpy(dtype=float, na_value=np.nan).ravel()[keep]
+    )
+    value_numeric = pd.Series(numeric)
+    is_text = np.isnan(numeric)
+    value_string = pd.Series(np.nan, index=value_numeric.index, dtype=object)
+    value_string[is_text] = pd.Series(values[is_text]).astype(str).to_numpy()
+
+    tcpuid = pd.Series(ids).astype(str)
+    observations = pd.DataFrame({
+        'observation_id': tcpuid + f'_{year}_' + variable_name,
+        'variable_name': variable_name,
+        'variable_category': categories[codes],
+        'value_numeric': value_numeric,
+        'value_string': value_string,
+        'unit': units[codes],
+        'source_table': source_name,
+        'presence_id': tcpuid + f'_{year}',
+        'period_id': f'CENSUS_{year}',
+        'variable_type_id': 'VAR_' + variable_name,
+    })
 
     print(f"    Created {len(observations)} observations from {rows_processed} CSDs")
     return observations
 
 
-def process_year_tables(year, tables_dir, gdb_path, mastvar_df, output_dir):
+def process_year_tables(year, tables_dir, gdb_path, output_dir, admin_import=False, var_lookup=None,
+                        cache_dir=None):
     """
     Process all tables for a given census year.
 
@@ -276,9 +344,17 @@ def process_year_tables(year, tables_dir, gdb_path, mastvar_df, output_dir):
         year: Census year (e.g., 1901)
         tables_dir: Directory containing year's tables
         gdb_path: Path to GDB file
-        mastvar_df: Master variables DataFrame
         output_dir: Output directory for CSV files
+        admin_import: Write neo4j-admin header files and gzipped data
+        var_lookup: Variable name -> category dict; defaults to the one
+            installed by init_worker. Raises ValueError if neither is set.
+        cache_dir: Optional directory for cached workbook parses
     """
+    if var_lookup is None:
+        var_lookup = _VAR_LOOKUP
+    if not var_lookup:
+        raise ValueError("No variable lookup: pass var_lookup or run in a worker started with init_worker")
+
     print(f"\n{'='*60}")
     print(f"Processing Census Year: {year}")
     print(f"{'='*60}")
@@ -290,6 +366,9 @@ def process_year_tables(year, tables_dir, gdb_path, mastvar_df, output_dir):
         print(f"ERROR: Could not load GDB layer for {year}")
         return
 
+    # Valid TCPUIDs, built once for all of the year's tables
+    valid_ids = set(gdf_mapping[id_col_name].dropna())
+
     # Find all Excel files for this year
     year_dir = tables_dir / f"{year}Tables" / str(year)
     if not year_dir.exists():
@@ -323,24 +402,26 @@ def process_year_tables(year, tables_dir, gdb_path, mastvar_df, output_dir):
             source_name = excel_file.stem.split('_')[1] if '_' in excel_file.stem else 'UNKNOWN'
 
         observations = process_census_table(
-            excel_file, year, gdf_mapping, id_col_name, mastvar_df, source_name
+            excel_file, year, valid_ids, var_lookup, source_name, cache_dir
         )
-        all_observations.extend(observations)
+        all_observations.append(observations)
 
+    all_observations = pd.concat(all_observations, ignore_index=True)
     print(f"\nTotal observations for {year}: {len(all_observations)}")
 
     # Export to CSV files
-    export_year_csvs(all_observations, year, output_dir)
+    export_year_csvs(all_observations, year, output_dir, admin_import)
 
 
-def export_year_csvs(observations, year, output_dir):
+def export_year_csvs(observations, year, output_dir, admin_import=False):
     """
     Export observations to Neo4j CSV files.
 
     Args:
-        observations: List of observation dictionaries
+        observations: DataFrame of observations from process_census_table
         year: Census year
         output_dir: Output directory
+        admin_import: Write neo4j-admin header files and gzipped data
     """
     print(f"\nExporting Neo4j CSV files for {year}...")
 
@@ -348,76 +429,64 @@ def export_year_csvs(observations, year, output_dir):
         print("  No observations to export")
         return
 
-    # 1. E13_Attribute_Assignment nodes
-    e13_nodes = []
-    for obs in observations:
-        e13_nodes.append({
-            'observation_id:ID': obs['observation_id'],
-            ':LABEL': 'E13_Attribute_Assignment',
-            'variable_name': obs['variable_name'],
-            'variable_category': obs['variable_category'],
-            'value_numeric:float': obs['value_numeric'] if obs['value_numeric'] is not None else '',
-            'value_string': obs['value_string'] if obs['value_string'] is not None else '',
-            'unit': obs['unit'],
-            'source_table': obs['source_table'],
-            'notes': ''
-        })
+    # Every output is a column projection of this one frame; constant
+    # columns are added as one-category Categoricals rather than per-file frames
+    n = len(observations)
+    observations['label'] = constant_column('E13_Attribute_Assignment', n)
+    observations['notes'] = constant_column('', n)
+    observations['p140_type'] = constant_column('P140_assigned_attribute_to', n)
+    observations['p4_type'] = constant_column('P4_has_time_span', n)
+    observations['p2_type'] = constant_column('P2_has_type', n)
 
-    df = pd.DataFrame(e13_nodes)
+    # 1. E13_Attribute_Assignment nodes
     output_path = output_dir / f'e13_observations_{year}.csv'
-    df.to_csv(output_path, index=False)
-    print(f"  ✓ E13 nodes: {len(df)} → {output_path.name}")
+    write_csv(observations, output_path, admin_import, columns={
+        'observation_id': 'observation_id:ID',
+        'label': ':LABEL',
+        'variable_name': 'variable_name',
+        'variable_category': 'variable_category',
+        'value_numeric': 'value_numeric:float',
+        'value_string': 'value_string',
+        'unit': 'unit',
+        'source_table': 'source_table',
+        'notes': 'notes'
+    })
+    print(f"  ✓ E13 nodes: {n} → {output_path.name}")
 
     # 2. P140_assigned_attribute_to relationships
-    p140_rels = []
-    for obs in observations:
-        p140_rels.append({
-            ':START_ID': obs['observation_id'],
-            ':END_ID': obs['presence_id'],
-            ':TYPE': 'P140_assigned_attribute_to'
-        })
-
-    df = pd.DataFrame(p140_rels)
     output_path = output_dir / f'p140_observation_to_presence_{year}.csv'
-    df.to_csv(output_path, index=False)
-    print(f"  ✓ P140 relationships: {len(df)} → {output_path.name}")
+    write_csv(observations, output_path, admin_import, columns={
+        'observation_id': ':START_ID',
+        'presence_id': ':END_ID',
+        'p140_type': ':TYPE'
+    })
+    print(f"  ✓ P140 relationships: {n} → {output_path.name}")
 
     # 3. P4_has_time_span relationships
-    p4_rels = []
-    for obs in observations:
-        p4_rels.append({
-            ':START_ID': obs['observation_id'],
-            ':END_ID': obs['period_id'],
-            ':TYPE': 'P4_has_time_span'
-        })
-
-    df = pd.DataFrame(p4_rels)
     output_path = output_dir / f'p4_observation_to_period_{year}.csv'
-    df.to_csv(output_path, index=False)
-    print(f"  ✓ P4 relationships: {len(df)} → {output_path.name}")
+    write_csv(observations, output_path, admin_import, columns={
+        'observation_id': ':START_ID',
+        'period_id': ':END_ID',
+        'p4_type': ':TYPE'
+    })
+    print(f"  ✓ P4 relationships: {n} → {output_path.name}")
 
     # 4. P2_has_type relationships
-    p2_rels = []
-    for obs in observations:
-        p2_rels.append({
-            ':START_ID': obs['observation_id'],
-            ':END_ID': obs['variable_type_id'],
-            ':TYPE': 'P2_has_type'
-        })
-
-    df = pd.DataFrame(p2_rels)
     output_path = output_dir / f'p2_observation_to_type_{year}.csv'
-    df.to_csv(output_path, index=False)
-    print(f"  ✓ P2 relationships: {len(df)} → {output_path.name}")
+    write_csv(observations, output_path, admin_import, columns={
+        'observation_id': ':START_ID',
+        'variable_type_id': ':END_ID',
+        'p2_type': ':TYPE'
+    })
+    print(f"  ✓ P2 relationships: {n} → {output_path.name}")
 
     # Summary statistics
     print(f"\n  Summary for {year}:")
     print(f"    Observations: {len(observations):,}")
-    df_obs = pd.DataFrame(observations)
-    print(f"    Unique CSDs: {df_obs['presence_id'].nunique():,}")
-    print(f"    Unique variables: {df_obs['variable_name'].nunique():,}")
-    print(f"    Categories: {df_obs['variable_category'].nunique()}")
-    print(f"      {df_obs['variable_category'].value_counts().to_dict()}")
+    print(f"    Unique CSDs: {observations['presence_id'].nunique():,}")
+    print(f"    Unique variables: {observations['variable_name'].nunique():,}")
+    print(f"    Categories: {observations['variable_category'].nunique()}")
+    print(f"      {observations['variable_category'].value_counts().to_dict()}")
 
 
 def main():
@@ -449,6 +518,15 @@ def main():
         default='neo4j_census_observations',
         help='Output directory for Neo4j CSV files'
     )
+    parser.add_argument(
+        '--cache-dir',
+        help='Cache parsed Excel sheets here and reuse them on later runs while newer than the workbooks'
+    )
+    parser.add_argument(
+        '--admin-import',
+        action='store_true',
+        help='Write header files and gzipped data for neo4j-admin database import instead of LOAD CSV files'
+    )
 
     args = parser.parse_args()
 
@@ -472,15 +550,23 @@ def main():
     print(f"Output directory: {output_dir.absolute()}")
 
     # Load master variables
-    mastvar_df = load_master_variables(mastvar_path)
+    mastvar_df = load_master_variables(mastvar_path, args.cache_dir)
 
     # Create variable type taxonomy
-    create_variable_types(mastvar_df, output_dir)
+    create_variable_types(mastvar_df, output_dir, args.admin_import)
 
     # Process each year
+    var_lookup = build_variable_lookup(mastvar_df)
     years = [int(y.strip()) for y in args.years.split(',')]
-    for year in years:
-        process_year_tables(year, tables_dir, gdb_path, mastvar_df, output_dir)
+    # Each year reads its own GDB layer and tables and writes its own files
+    # The variable lookup is sent once per worker rather than with every year
+    worker = functools.partial(
+        process_year_tables, tables_dir=tables_dir, gdb_path=gdb_path,
+        output_dir=output_dir, admin_import=args.admin_import, cache_dir=args.cache_dir
+    )
+    with ProcessPoolExecutor(max_workers=min(len(years), os.cpu_count() or 1),
+                             initializer=init_worker, initargs=(var_lookup,)) as executor:
+        list(executor.map(worker, years))
 
     print(f"\n{'='*60}")
     print("✓ Census observations processing complete!")
@@ -13,14 +13,22 @@ Version: 2.0
 """
 
 import argparse
+import csv
+import gzip
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import numpy as np
 import pandas as pd
-import geopandas as gpd
+import pyogrio
 from pathlib import Path
 import sys
 from collections import defaultdict
 import re
 import hashlib
 
+from pickle_cache import excel_cache_path, load_fresh_pickle, read_excel_cached
+
 
 # ============================================================================
 # Unit Mapping
@@ -41,129 +49,202 @@ UNIT_REGISTRY = {
 }
 
 
-def infer_unit_id(variable_name):
-    """Infer measurement unit ID from variable name."""
-    name_upper = variable_name.upper()
-
-    if any(x in name_upper for x in ['POP', 'AGE_', 'RELIGION', 'BIRTH', 'LANG', 'RACE', 'OCCUPATION', 'HOUSE']):
-        return 'UNIT_PERSONS'
-    elif 'ACRES' in name_upper or 'ARE_' in name_upper:
-        return 'UNIT_ACRES'
-    elif 'SQ_MI' in name_upper or 'SQMI' in name_upper:
-        return 'UNIT_SQUARE_MILES'
-    elif 'BUSHEL' in name_upper:
-        return 'UNIT_BUSHELS'
-    elif 'DOLLAR' in name_upper or 'VALUE' in name_upper:
-        return 'UNIT_DOLLARS'
-    elif 'TON' in name_upper:
-        return 'UNIT_TONS'
-    elif 'BARREL' in name_upper:
-        return 'UNIT_BARRELS'
-    elif 'HEAD' in name_upper or 'LIVESTOCK' in name_upper or 'CATTLE' in name_upper or 'HORSE' in name_upper:
-        return 'UNIT_HEAD'
-    elif 'FARM' in name_upper and ('COUNT' in name_upper or '_N' in name_upper):
-        return 'UNIT_FARMS'
-    elif 'PERCENT' in name_upper or 'PCT' in name_upper:
-        return 'UNIT_PERCENT'
-    else:
-        return 'UNIT_COUNT'  # Default
+# (pattern, unit ID) checked in order against the upper-cased variable name
+UNIT_PATTERNS = [
+    (re.compile(r'POP|AGE_|RELIGION|BIRTH|LANG|RACE|OCCUPATION|HOUSE'), 'UNIT_PERSONS'),
+    (re.compile(r'ACRES|ARE_'), 'UNIT_ACRES'),
+    (re.compile(r'SQ_MI|SQMI'), 'UNIT_SQUARE_MILES'),
+    (re.compile(r'BUSHEL'), 'UNIT_BUSHELS'),
+    (re.compile(r'DOLLAR|VALUE'), 'UNIT_DOLLARS'),
+    (re.compile(r'TON'), 'UNIT_TONS'),
+    (re.compile(r'BARREL'), 'UNIT_BARRELS'),
+    (re.compile(r'HEAD|LIVESTOCK|CATTLE|HORSE'), 'UNIT_HEAD'),
+    (re.compile(r'FARM.*(?:COUNT|_N)|(?:COUNT|_N).*FARM'), 'UNIT_FARMS'),
+    (re.compile(r'PERCENT|PCT'), 'UNIT_PERCENT'),
+]
+
+
+def infer_units_vec(names):
+    """
+    Infer measurement unit IDs for a Series of variable names.
+
+    The first matching UNIT_PATTERNS entry wins; names matching none are
+    plain counts (UNIT_COUNT). Call on distinct names and map the result back.
+    """
+    upper = names.str.upper()
+    return pd.Series(
+        np.select(
+            [upper.str.contains(pattern).to_numpy(dtype=bool) for pattern, _ in UNIT_PATTERNS],
+            [unit for _, unit in UNIT_PATTERNS],
+            default='UNIT_COUNT'
+        ),
+        index=names.index
+    )
 
 
 # ============================================================================
 # Shared Data Structures
 # ============================================================================
 
+REL_HEADER = [':START_ID', ':END_ID', ':TYPE']
+
+# Per-cell outputs streamed to disk table by table: (name, filename, header)
+STREAMED_OUTPUTS = [
+    ('measurements', 'e16_measurements_all.csv', ['measurement_id:ID', ':LABEL', 'label', 'notes']),
+    ('dimensions', 'e54_dimensions_all.csv', ['dimension_id:ID', ':LABEL', 'value:float', 'value_string']),
+    ('p39_measured', 'p39_measured_all.csv', REL_HEADER),
+    ('p40_observed_dimension', 'p40_observed_dimension_all.csv', REL_HEADER),
+    ('p91_has_unit', 'p91_has_unit_all.csv', REL_HEADER),
+    ('p2_has_type', 'p2_has_type_all.csv', REL_HEADER),
+    ('p4_measurement_timespan', 'p4_measurement_timespan_all.csv', REL_HEADER),
+    ('p70_documents', 'p70_documents_all.csv', REL_HEADER),
+]
+
+# Buffer size for the streamed CSV handles; each table appends millions of
+# short rows, so a large buffer keeps them to a few big writes
+WRITE_BUFFER_SIZE = 1 << 20
+
+
 class CensusDataV2:
-    """Container for all v2.0 CIDOC-CRM entities."""
+    """
+    Container for all v2.0 CIDOC-CRM entities.
 
-    def __init__(self):
+    The small per-year and per-source nodes are kept in lists and written by
+    export_v2_csvs. The per-cell measurements, dimensions and their
+    relationships (see STREAMED_OUTPUTS) are written straight to open CSV
+    files as each table is processed, so they are never held in memory.
+    With compress=True those files are gzipped (*.csv.gz).
+    """
+
+    def __init__(self, output_dir, compress=False):
         # Nodes
-        self.measurements = []        # E16_Measurement
-        self.dimensions = []          # E54_Dimension
         self.timespans = []           # E52_Time-Span
         self.periods = []             # E4_Period
         self.info_objects = []        # E73_Information_Object
 
         # Relationships
-        self.p39_measured = []        # E16 → E93_Presence
-        self.p40_observed_dimension = []  # E16 → E54
-        self.p91_has_unit = []        # E54 → E58
-        self.p2_has_type = []         # E16 → E55
-        self.p4_measurement_timespan = []  # E16 → E52
         self.p4_period_timespan = []  # E4 → E52
-        self.p70_documents = []       # E73 → E16
+
+        # Streamed: E16_Measurement, E54_Dimension and
+        # P39 (E16 → E93_Presence), P40 (E16 → E54), P91 (E54 → E58),
+        # P2 (E16 → E55), P4 (E16 → E52), P70 (E73 → E16)
+        self._files = {}
+        self.filenames = {}
+        self.counts = defaultdict(int)
+        for name, filename, header in STREAMED_OUTPUTS:
+            if compress:
+                filename += '.gz'
+                f = gzip.open(Path(output_dir) / filename, 'wt', newline='', compresslevel=6)
+            else:
+                f = open(Path(output_dir) / filename, 'w', newline='', buffering=WRITE_BUFFER_SIZE)
+            csv.writer(f, lineterminator='\n').writerow(header)
+            self._files[name] = f
+            self.filenames[name] = filename
 
         # Tracking
         self.source_files = set()
+        # Per-year duplicate tracking, cleared by process_year_tables_v2
+        self.seen_measurements = set()  # measurement IDs already written
+        self.documented = defaultdict(set)  # info object ID -> measurement IDs linked by P70
+
+    def write(self, name, *columns):
+        """
+        Append rows to a streamed output.
+
+        Args:
+            name: Output name from STREAMED_OUTPUTS
+            *columns: One aligned Series per CSV column; constant columns
+                (labels, relationship types) may be passed as plain strings
+        """
+        df = pd.DataFrame(dict(enumerate(columns)))
+        df.to_csv(self._files[name], header=False, index=False, lineterminator='\n')
+        self.counts[name] += len(df)
+
+    def close(self):
+        """Flush and close the streamed output files."""
+        for f in self._files.values():
+            f.close()
 
 
 # ============================================================================
 # Data Loading
 # ============================================================================
 
-def load_master_variables(mastvar_path):
+def read_census_table(table_path, year, cache_dir=None):
+    """
+    Read a census table, reusing a cached parse when there is one.
+
+    1851-1901 tables have the TCPUID header on row 1; 1911+ tables have 3
+    title rows above the header. Without a usable cache entry, only the
+    header row is read to decide, so the sheet itself is parsed once.
+    """
+    id_header = f'TCPUID_CSD_{year}'
+    if cache_dir is not None:
+        mtime = table_path.stat().st_mtime
+        df = load_fresh_pickle(excel_cache_path(cache_dir, table_path), mtime)
+        if df is not None:
+            if id_header in df.columns:
+                return df
+            return read_excel_cached(table_path, 3, cache_dir)
+        df = load_fresh_pickle(excel_cache_path(cache_dir, table_path, 3), mtime)
+        if df is not None:
+            return df
+
+    header = pd.read_excel(table_path, nrows=0)
+    skiprows = None if id_header in header.columns else 3
+    return read_excel_cached(table_path, skiprows, cache_dir)
+
+
+def load_master_variables(mastvar_path, cache_dir=None):
     """Load master variables file to understand variable definitions."""
     print(f"Loading master variables from {mastvar_path}...")
-    df = pd.read_excel(mastvar_path)
+    df = read_excel_cached(mastvar_path, cache_dir=cache_dir)
     print(f"  Found {len(df)} variable definitions")
     print(f"  Categories: {df['Category'].unique().tolist()}")
     return df
 
 
 def load_gdb_layer(gdb_path, year):
-    """Load GDB layer for a specific year."""
+    """Load the TCPUID column of the GDB layer for a specific year."""
     layer_name = f"CANADA_{year}_CSD"
     print(f"\n  Loading GDB layer: {layer_name}")
 
     try:
-        gdf = gpd.read_file(gdb_path, layer=layer_name)
+        fields = list(pyogrio.read_info(gdb_path, layer=layer_name)['fields'])
     except Exception as e:
         print(f"    ERROR loading layer: {e}")
         return None, None
 
-    print(f"    Features: {len(gdf)}")
-
     tcpuid_col = f"TCPUID_CSD_{year}"
-    if tcpuid_col not in gdf.columns:
+    if tcpuid_col not in fields:
         print(f"    ERROR: {tcpuid_col} not found")
-        print(f"    Columns: {gdf.columns.tolist()}")
+        print(f"    Columns: {fields}")
         return None, None
 
+    # Read just the TCPUID column; geometry is never needed here
+    try:
+        df = pyogrio.read_dataframe(gdb_path, layer=layer_name, columns=[tcpuid_col], read_geometry=False)
+    except Exception as e:
+        print(f"    ERROR loading layer: {e}")
+        return None, None
+
+    print(f"    Features: {len(df)}")
     print(f"    Using ID column: {tcpuid_col}")
-    return gdf[[tcpuid_col]], tcpuid_col
+    return df, tcpuid_col
+
+
+_YEAR_SUFFIX = re.compile(r'_\d{4}$')
 
 
 def normalize_column_name(col):
     """Normalize column name by removing year suffix."""
-    return re.sub(r'_\d{4}$', '', col)
+    return _YEAR_SUFFIX.sub('', col)
 
 
 # ============================================================================
 # v2.0 Entity Generation
 # ============================================================================
 
-def create_measurement(tcpuid, year, var_name, category, source_name):
-    """Create E16_Measurement node."""
-    measurement_id = f"MEAS_{tcpuid}_{year}_{var_name}"
-    return {
-        'measurement_id:ID': measurement_id,
-        ':LABEL': 'E16_Measurement',
-        'label': f"{var_name} for {tcpuid} in {year}",
-        'notes': ''
-    }
-
-
-def create_dimension(tcpuid, year, var_name, value_numeric, value_string):
-    """Create E54_Dimension node."""
-    dimension_id = f"DIM_{tcpuid}_{year}_{var_name}"
-    return {
-        'dimension_id:ID': dimension_id,
-        ':LABEL': 'E54_Dimension',
-        'value:float': value_numeric if value_numeric is not None else '',
-        'value_string': value_string if value_string is not None else ''
-    }
-
-
 def create_info_object(source_name, year):
     """Create E73_Information_Object node with Borealis provenance."""
     info_object_id = f"SOURCE_{year}_{source_name}"
@@ -187,20 +268,44 @@ def create_info_object(source_name, year):
 # Census Table Processing
 # ============================================================================
 
-def process_census_table_v2(table_path, year, gdf_mapping, id_col_name, mastvar_df,
-                            source_name, data_v2):
-    """Process a single census table and create v2.0 observations."""
+def recode_categorical(cat, values):
+    """
+    Map a categorical Series through per-category values, keeping it categorical.
+
+    Args:
+        cat: Categorical Series
+        values: Sequence aligned with cat.cat.categories
+
+    Returns:
+        Categorical Series holding values[code] for each row
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    return pd.Series(
+        pd.Categorical.from_codes(codes[cat.cat.codes.to_numpy()], categories=uniques),
+        index=cat.index
+    )
+
+
+def process_census_table_v2(table_path, source_name, year, valid_ids, cache_dir=None):
+    """
+    Process a single census table and create v2.0 observations.
+
+    Runs in a worker process, so nothing is written here; the caller streams
+    the result with write_table_v2.
+
+    Returns:
+        tuple: (E73 info object dict, DataFrame with one row per measurement),
+        or None if the table could not be read
+    """
     print(f"\n  Processing {table_path.name}...")
 
     # Read table
     df = None
     try:
-        df = pd.read_excel(table_path)
-        if f'TCPUID_CSD_{year}' not in df.columns:
-            df = pd.read_excel(table_path, skiprows=3)
+        df = read_census_table(table_path, year, cache_dir)
     except Exception as e:
         print(f"    ERROR reading file: {e}")
-        return
+        return None
 
     # Find ID column
     id_col = None
@@ -218,7 +323,7 @@ def process_census_table_v2(table_path, year, gdf_mapping, id_col_name, mastvar_
         print(f"    ERROR: Could not find ID column")
         print(f"    Looking for: TCPUID_CSD_{year} or {source_name}_{year}")
         print(f"    Columns: {df.columns.tolist()[:15]}")
-        return
+        return None
 
     print(f"    Using ID column: {id_col}")
     print(f"    Processing {len(df)} rows...")
@@ -232,118 +337,141 @@ def process_census_table_v2(table_path, year, gdf_mapping, id_col_name, mastvar_
     data_cols = [col for col in df.columns if col not in metadata_cols]
     print(f"    Found {len(data_cols)} data columns")
 
+    # Strip year suffixes once per column rather than once per cell
+    col_to_var = {col: normalize_column_name(str(col)) for col in data_cols}
+
     # Create info object for this source
     info_obj = create_info_object(source_name, year)
-    if info_obj['info_object_id:ID'] not in data_v2.source_files:
-        data_v2.info_objects.append(info_obj)
-        data_v2.source_files.add(info_obj['info_object_id:ID'])
-
-    rows_processed = 0
-    observations_created = 0
-
-    for idx, row in df.iterrows():
-        csd_table_id = row[id_col]
-
-        if pd.isna(csd_table_id):
-            continue
-
-        # Validate ID exists in GDB
-        if gdf_mapping is not None:
-            match = gdf_mapping[gdf_mapping[id_col_name] == csd_table_id]
-            if len(match) == 0:
-                continue
-
-        tcpuid = csd_table_id
-        presence_id = f"{tcpuid}_{year}"
-        timespan_id = f"TIMESPAN_{year}"
-
-        # Process each variable
-        for col in data_cols:
-            value = row[col]
-            if pd.isna(value):
-                continue
-
-            var_name_normalized = normalize_column_name(col)
-
-            # Determine value type
-            if isinstance(value, (int, float)):
-                value_numeric = float(value)
-                value_string = None
-            else:
-                value_numeric = None
-                value_string = str(value)
-
-            # Look up variable metadata
-            var_info = mastvar_df[mastvar_df['Name'] == var_name_normalized]
-            if len(var_info) > 0:
-                category = var_info.iloc[0]['Category']
-            else:
-                category = 'UNKNOWN'
-
-            # Infer unit
-            unit_id = infer_unit_id(var_name_normalized)
-
-            # Create E16_Measurement
-            measurement = create_measurement(tcpuid, year, var_name_normalized, category, source_name)
-            data_v2.measurements.append(measurement)
-
-            # Create E54_Dimension
-            dimension = create_dimension(tcpuid, year, var_name_normalized, value_numeric, value_string)
-            data_v2.dimensions.append(dimension)
 
-            # Create relationships
-            measurement_id = measurement['measurement_id:ID']
-            dimension_id = dimension['dimension_id:ID']
-            variable_type_id = f"VAR_{var_name_normalized}"
-
-            data_v2.p39_measured.append({
-                ':START_ID': measurement_id,
-                ':END_ID': presence_id,
-                ':TYPE': 'P39_measured'
-            })
-
-            data_v2.p40_observed_dimension.append({
-                ':START_ID': measurement_id,
-                ':END_ID': dimension_id,
-                ':TYPE': 'P40_observed_dimension'
-            })
+    # Keep rows with an ID that exists in the GDB layer
+    df = df.dropna(subset=[id_col])
+    if valid_ids is not None:
+        df = df[df[id_col].isin(valid_ids)]
+    rows_processed = len(df)
+
+    # Columns that are empty for every kept CSD produce no cells
+    block = df[data_cols].dropna(axis=1, how='all')
+    data_cols = list(block.columns)
+
+    # One row per non-null cell in row-major (CSD, then column) order,
+    # flattened straight from the value block rather than iterating rows
+    values = pd.Series(block.to_numpy().ravel())
+    keep = values.notna().to_numpy()
+    long = pd.DataFrame({
+        'row_idx': np.repeat(np.arange(len(df)), len(data_cols))[keep],
+        'col_idx': np.tile(np.arange(len(data_cols)), len(df))[keep],
+        'value': values[keep].reset_index(drop=True)
+    })
 
-            data_v2.p91_has_unit.append({
-                ':START_ID': dimension_id,
-                ':END_ID': unit_id,
-                ':TYPE': 'P91_has_unit'
-            })
+    # ID prefixes and label suffixes depend only on the CSD, so format them
+    # once per row and repeat them across that row's cells
+    tcpuid = df[id_col].astype(str)
+    presence_id = tcpuid + f'_{year}'
+    row_strings = pd.DataFrame({
+        'meas_prefix': 'MEAS_' + presence_id + '_',
+        'dim_prefix': 'DIM_' + presence_id + '_',
+        'label_suffix': ' for ' + tcpuid + f' in {year}'
+    }).iloc[long['row_idx'].to_numpy()].reset_index(drop=True)
+
+    # Presence IDs repeat once per variable, so keep one copy per CSD
+    presence_codes, presence_uniques = pd.factorize(presence_id)
+    presence_cat = pd.Categorical.from_codes(
+        presence_codes[long['row_idx'].to_numpy()], categories=presence_uniques
+    )
 
-            data_v2.p2_has_type.append({
-                ':START_ID': measurement_id,
-                ':END_ID': variable_type_id,
-                ':TYPE': 'P2_has_type'
-            })
+    # Variable names as integer codes into the table's distinct names, so no
+    # per-cell string is built until the IDs are formatted below
+    var_codes, var_uniques = pd.factorize(pd.Index([col_to_var[col] for col in data_cols]))
+    var = pd.Series(pd.Categorical.from_codes(var_codes[long['col_idx'].to_numpy()], categories=var_uniques))
+
+    # Infer the unit once per distinct variable name; the repeated names stay
+    # categorical so each string is stored only once
+    var_names = pd.Series(var.cat.categories, dtype=object)
+    unit_id = recode_categorical(var, infer_units_vec(var_names))
+    var_str = var.astype(str)
+
+    # Determine value type: numbers go to value:float, anything else to value_string
+    value_numeric = pd.to_numeric(long['value'], errors='coerce').astype(float)
+    value_string = long['value'].astype(str).where(value_numeric.isna())
+
+    cells = pd.DataFrame({
+        'measurement_id': row_strings['meas_prefix'] + var_str,
+        'dimension_id': row_strings['dim_prefix'] + var_str,
+        'presence_id': presence_cat,
+        'variable_type_id': var.cat.rename_categories('VAR_' + var.cat.categories),
+        'unit_id': unit_id,
+        'label': var_str + row_strings['label_suffix'],
+        'value': value_numeric.astype(object).where(value_numeric.notna(), ''),
+        'value_string': value_string.fillna('')
+    })
 
-            data_v2.p4_measurement_timespan.append({
-                ':START_ID': measurement_id,
-                ':END_ID': timespan_id,
-                ':TYPE': 'P4_has_time-span'
-            })
+    print(f"    Created {len(cells)} measurements from {rows_processed} CSDs")
+    return info_obj, cells
 
-            data_v2.p70_documents.append({
-                ':START_ID': info_obj['info_object_id:ID'],
-                ':END_ID': measurement_id,
-                ':TYPE': 'P70_documents'
-            })
 
-            observations_created += 1
+def write_table_v2(data_v2, info_obj, cells, year):
+    """
+    Register a table's source and stream its measurements to the output files.
 
-        rows_processed += 1
+    Args:
+        data_v2: CensusDataV2 container
+        info_obj: E73 info object dict from process_census_table_v2
+        cells: Per-measurement DataFrame from process_census_table_v2
+        year: Census year
+    """
+    info_object_id = info_obj['info_object_id:ID']
+    if info_object_id not in data_v2.source_files:
+        data_v2.info_objects.append(info_obj)
+        data_v2.source_files.add(info_object_id)
+
+    total = len(cells)
+    cells = cells.drop_duplicates('measurement_id')
+
+    # Every table documents all of its measurements, including ones another
+    # table already wrote; only a repeated (source, measurement) link is dropped
+    documented = data_v2.documented[info_object_id]
+    p70_ids = cells['measurement_id']
+    already = documented.intersection(p70_ids)
+    if already:
+        p70_ids = p70_ids[~p70_ids.isin(already)]
+    documented.update(p70_ids)
+
+    # Skip cells already written from another table for the same CSD, year
+    # and variable, so each measurement ID is emitted once
+    seen = data_v2.seen_measurements
+    already = seen.intersection(cells['measurement_id'])
+    if already:
+        cells = cells[~cells['measurement_id'].isin(already)]
+    seen.update(cells['measurement_id'])
+    skipped = total - len(cells)
+    if skipped:
+        data_v2.counts['duplicates'] += skipped
+        print(f"    Skipped {skipped:,} measurements already written from another table")
+
+    measurement_id = cells['measurement_id']
+    dimension_id = cells['dimension_id']
+    timespan_id = f"TIMESPAN_{year}"
+
+    # E16_Measurement
+    data_v2.write('measurements', measurement_id, 'E16_Measurement', cells['label'], '')
+
+    # E54_Dimension
+    data_v2.write('dimensions', dimension_id, 'E54_Dimension', cells['value'], cells['value_string'])
 
-    print(f"    Created {observations_created} measurements from {rows_processed} CSDs")
+    # Relationships
+    data_v2.write('p39_measured', measurement_id, cells['presence_id'], 'P39_measured')
+    data_v2.write('p40_observed_dimension', measurement_id, dimension_id, 'P40_observed_dimension')
+    data_v2.write('p91_has_unit', dimension_id, cells['unit_id'], 'P91_has_unit')
+    data_v2.write('p2_has_type', measurement_id, cells['variable_type_id'], 'P2_has_type')
+    data_v2.write('p4_measurement_timespan', measurement_id, timespan_id, 'P4_has_time-span')
+    data_v2.write('p70_documents', info_object_id, p70_ids, 'P70_documents')
 
 
 # ============================================================================
 # Year Processing
 # ============================================================================
 
-def process_year_tables_v2(year, tables_dir, gdb_path, mastvar_df, data_v2):
+def process_year_tables_v2(year, tables_dir, gdb_path, data_v2, cache_dir=None):
     """Process all tables for a given census year (v2.0)."""
     print(f"\n{'='*60}")
     print(f"Processing Census Year: {year}")
@@ -355,6 +483,9 @@ def process_year_tables_v2(year, tables_dir, gdb_path, mastvar_df, data_v2):
         print(f"ERROR: Could not load GDB layer for {year}")
         return
 
+    # Valid TCPUIDs, built once for all of the year's tables
+    valid_ids = set(gdf_mapping[id_col_name].dropna().unique())
+
     # Find Excel files
     year_dir = tables_dir / f"{year}Tables" / str(year)
     if not year_dir.exists():
@@ -401,17 +532,26 @@ def process_year_tables_v2(year, tables_dir, gdb_path, mastvar_df, data_v2):
         ':TYPE': 'P4_has_time-span'
     })
 
-    # Process each table
+    # Measurement IDs embed the year, so only this year's tables can repeat
+    # them; forgetting earlier years keeps the tracking sets bounded
+    data_v2.seen_measurements.clear()
+    data_v2.documented.clear()
+
+    # Process tables in parallel; each is independent, and results come back
+    # in file order to be streamed from this process
+    source_names = []
     for excel_file in excel_files:
         match = re.search(r'_([VT]\d+[A-Z]*\d*)_', excel_file.name)
         if match:
-            source_name = match.group(1)
+            source_names.append(match.group(1))
         else:
-            source_name = excel_file.stem.split('_')[1] if '_' in excel_file.stem else 'UNKNOWN'
+            source_names.append(excel_file.stem.split('_')[1] if '_' in excel_file.stem else 'UNKNOWN')
 
-        process_census_table_v2(
-            excel_file, year, gdf_mapping, id_col_name, mastvar_df, source_name, data_v2
-        )
+    worker = partial(process_census_table_v2, year=year, valid_ids=valid_ids, cache_dir=cache_dir)
+    with ProcessPoolExecutor(max_workers=min(len(excel_files), os.cpu_count() or 1)) as executor:
+        for result in executor.map(worker, excel_files, source_names):
+            if result is not None:
+                write_table_v2(data_v2, *result, year)
 
 
 # ============================================================================
@@ -450,39 +590,26 @@ def export_v2_csvs(data_v2, output_dir):
     df.to_csv(output_dir / 'e4_periods.csv', index=False)
     print(f"  ✓ E4 periods: {len(df)} → e4_periods.csv")
 
-    # E16_Measurement (all)
-    df = pd.DataFrame(data_v2.measurements)
-    df.to_csv(output_dir / 'e16_measurements_all.csv', index=False)
-    print(f"  ✓ E16 measurements: {len(df):,} → e16_measurements_all.csv")
-
-    # E54_Dimension (all)
-    df = pd.DataFrame(data_v2.dimensions)
-    df.to_csv(output_dir / 'e54_dimensions_all.csv', index=False)
-    print(f"  ✓ E54 dimensions: {len(df):,} → e54_dimensions_all.csv")
-
     # E73_Information_Object (all)
     df = pd.DataFrame(data_v2.info_objects)
     df.to_csv(output_dir / 'e73_information_objects.csv', index=False)
     print(f"  ✓ E73 info objects: {len(df)} → e73_information_objects.csv")
 
-    # Relationships
-    for name, data, filename in [
-        ('P39 measured', data_v2.p39_measured, 'p39_measured_all.csv'),
-        ('P40 observed_dimension', data_v2.p40_observed_dimension, 'p40_observed_dimension_all.csv'),
-        ('P91 has_unit', data_v2.p91_has_unit, 'p91_has_unit_all.csv'),
-        ('P2 has_type', data_v2.p2_has_type, 'p2_has_type_all.csv'),
-        ('P4 measurement→timespan', data_v2.p4_measurement_timespan, 'p4_measurement_timespan_all.csv'),
-        ('P4 period→timespan', data_v2.p4_period_timespan, 'p4_period_timespan.csv'),
-        ('P70 documents', data_v2.p70_documents, 'p70_documents_all.csv'),
-    ]:
-        df = pd.DataFrame(data)
-        df.to_csv(output_dir / filename, index=False)
-        print(f"  ✓ {name}: {len(df):,} → {filename}")
+    # P4 period→timespan
+    df = pd.DataFrame(data_v2.p4_period_timespan)
+    df.to_csv(output_dir / 'p4_period_timespan.csv', index=False)
+    print(f"  ✓ P4 period→timespan: {len(df):,} → p4_period_timespan.csv")
+
+    # Per-cell nodes and relationships were streamed while processing tables
+    data_v2.close()
+    for name, _, _ in STREAMED_OUTPUTS:
+        print(f"  ✓ {name}: {data_v2.counts[name]:,} → {data_v2.filenames[name]}")
 
     # Summary
     print(f"\n  Summary:")
-    print(f"    Total measurements: {len(data_v2.measurements):,}")
-    print(f"    Total dimensions: {len(data_v2.dimensions):,}")
+    print(f"    Total measurements: {data_v2.counts['measurements']:,}")
+    print(f"    Total dimensions: {data_v2.counts['dimensions']:,}")
+    print(f"    Duplicate measurements skipped: {data_v2.counts['duplicates']:,}")
     print(f"    Unique units: {len(units)}")
     print(f"    Time-spans: {len(data_v2.timespans)}")
     print(f"    Periods: {len(data_v2.periods)}")
@@ -522,6 +649,15 @@ def main():
         default='neo4j_census_v2',
         help='Output directory for Neo4j CSV files'
     )
+    parser.add_argument(
+        '--cache-dir',
+        help='Cache parsed Excel sheets here and reuse them on later runs while newer than the workbooks'
+    )
+    parser.add_argument(
+        '--gzip',
+        action='store_true',
+        help='Gzip the per-measurement *_all.csv outputs (LOAD CSV reads them as *_all.csv.gz)'
+    )
 
     args = parser.parse_args()
 
@@ -542,15 +678,15 @@ def main():
     print(f"Output directory: {output_dir.absolute()}")
 
     # Load master variables
-    mastvar_df = load_master_variables(mastvar_path)
+    load_master_variables(mastvar_path, args.cache_dir)
 
     # Initialize data container
-    data_v2 = CensusDataV2()
+    data_v2 = CensusDataV2(output_dir, compress=args.gzip)
 
     # Process each year
     years = [int(y.strip()) for y in args.years.split(',')]
     for year in years:
-        process_year_tables_v2(year, tables_dir, gdb_path, mastvar_df, data_v2)
+        process_year_tables_v2(year, tables_dir, gdb_path, data_v2, args.cache_dir)
 
     # Export all data
     export_v2_csvs(data_v2, output_dir)
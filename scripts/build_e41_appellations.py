@@ -21,94 +21,92 @@ def load_canonical_names(canonical_file: Path) -> pd.DataFrame:
     return df
 
 
-def create_e41_appellations(canonical_df: pd.DataFrame) -> pd.DataFrame:
+def create_e41_appellations(ocr_corrections: pd.DataFrame) -> pd.DataFrame:
     """
     Create E41_Appellation nodes for:
     1. Canonical names (corrected OCR variants)
     2. Original variant names that were OCR errors
-    """
-    appellations = []
 
-    # Get unique CSDs with canonical names applied (OCR corrections)
-    ocr_corrections = canonical_df[canonical_df['should_apply'] == True].copy()
+    ocr_corrections holds the canonical-name records with should_apply set.
+    """
+    ocr_corrections = ocr_corrections[ocr_corrections['tcpuid'].notna()]
 
     print(f"\n  Processing {len(ocr_corrections)} OCR correction records...", file=sys.stderr)
 
-    # Group by TCPUID to get all name variants
-    for tcpuid, group in ocr_corrections.groupby('tcpuid'):
-        canonical_name = group.iloc[0]['canonical_name']
-
-        # Create canonical appellation
-        appellations.append({
-            'appellation_id:ID': f'APP_{tcpuid}_CANONICAL',
-            ':LABEL': 'E41_Appellation',
-            'name': canonical_name,
-            'type': 'canonical',
-            'tcpuid': tcpuid,
-            'notes': f'Canonical name for {tcpuid} (OCR corrected)'
-        })
-
-        # Create variant appellations for each original name
-        for _, row in group.iterrows():
-            original = row['original_name']
-            year = row['year']
-
-            if original != canonical_name:
-                appellations.append({
-                    'appellation_id:ID': f'APP_{tcpuid}_{year}_VARIANT',
-                    ':LABEL': 'E41_Appellation',
-                    'name': original,
-                    'type': 'variant',
-                    'tcpuid': tcpuid,
-                    'year': year,
-                    'notes': f'OCR variant of "{canonical_name}"'
-                })
-
-    # Also track intentional name changes (for context)
-    name_changes = canonical_df[canonical_df['reason'] == 'name_change'].copy()
-    print(f"  Found {len(name_changes)} intentional name changes (not creating E41s)", file=sys.stderr)
-
-    return pd.DataFrame(appellations)
-
-
-def create_p1_is_identified_by(canonical_df: pd.DataFrame) -> pd.DataFrame:
+    # Canonical appellation: the first canonical name recorded for each TCPUID
+    canon = ocr_corrections.drop_duplicates('tcpuid')
+    canon_tcpuid = canon['tcpuid'].astype(str)
+    canonical = pd.DataFrame({
+        'appellation_id:ID': 'APP_' + canon_tcpuid + '_CANONICAL',
+        ':LABEL': 'E41_Appellation',
+        'name': canon['canonical_name'],
+        'type': 'canonical',
+        'tcpuid': canon['tcpuid'],
+        'notes': 'Canonical name for ' + canon_tcpuid + ' (OCR corrected)'
+    })
+
+    # Variant appellation for each original name that differs from it
+    canonical_name = ocr_corrections['tcpuid'].map(canon.set_index('tcpuid')['canonical_name'])
+    is_variant = ocr_corrections['original_name'] != canonical_name
+    variants = ocr_corrections[is_variant]
+    variant_tcpuid = variants['tcpuid'].astype(str)
+    variant = pd.DataFrame({
+        'appellation_id:ID': 'APP_' + variant_tcpuid + '_' + variants['year'].astype(str) + '_VARIANT',
+        ':LABEL': 'E41_Appellation',
+        'name': variants['original_name'],
+        'type': 'variant',
+        'tcpuid': variants['tcpuid'],
+        'year': variants['year'],
+        'notes': 'OCR variant of "' + canonical_name[is_variant].astype(str) + '"'
+    })
+
+    # Each TCPUID's canonical appellation followed by its variants
+    appellations = (
+        pd.concat([canonical, variant])
+        .sort_values('tcpuid', kind='stable')
+        .reset_index(drop=True)
+    )
+
+    return appellations
+
+
+def create_p1_is_identified_by(ocr_corrections: pd.DataFrame) -> pd.DataFrame:
     """
     P1_is_identified_by: E53_Place -> E41_Appellation
 
     Links:
     1. E53_Place -> canonical E41_Appellation (primary name)
     2. E93_Presence -> variant E41_Appellation (name used in that year)
-    """
-    relationships = []
-
-    # Get OCR corrections
-    ocr_corrections = canonical_df[canonical_df['should_apply'] == True].copy()
 
+    ocr_corrections holds the canonical-name records with should_apply set.
+    """
     # For each TCPUID, link E53_Place to canonical appellation
-    for tcpuid in ocr_corrections['tcpuid'].unique():
-        relationships.append({
-            ':START_ID': tcpuid,  # E53_Place ID
-            ':END_ID': f'APP_{tcpuid}_CANONICAL',
-            ':TYPE': 'P1_is_identified_by',
-            'type': 'canonical_name'
-        })
+    tcpuids = ocr_corrections['tcpuid'].drop_duplicates().reset_index(drop=True).astype(object)
+    canonical_links = pd.DataFrame({
+        ':START_ID': tcpuids,  # E53_Place ID
+        ':END_ID': 'APP_' + tcpuids.astype(str) + '_CANONICAL',
+        ':TYPE': 'P1_is_identified_by',
+        'type': 'canonical_name'
+    })
 
     # For each E93_Presence, link to variant appellation (if different from canonical)
-    for _, row in ocr_corrections.iterrows():
-        if row['original_name'] != row['canonical_name']:
-            presence_id = f"{row['tcpuid']}_{row['year']}"
-            relationships.append({
-                ':START_ID': presence_id,  # E93_Presence ID
-                ':END_ID': f"APP_{row['tcpuid']}_{row['year']}_VARIANT",
-                ':TYPE': 'P1_is_identified_by',
-                'type': 'variant_name'
-            })
+    variants = ocr_corrections[ocr_corrections['original_name'] != ocr_corrections['canonical_name']]
+    presence_id = variants['tcpuid'].astype(str) + '_' + variants['year'].astype(str)
+    variant_links = pd.DataFrame({
+        ':START_ID': presence_id,  # E93_Presence ID
+        ':END_ID': 'APP_' + presence_id + '_VARIANT',
+        ':TYPE': 'P1_is_identified_by',
+        'type': 'variant_name'
+    })
 
-    return pd.DataFrame(relationships)
+    return pd.concat([canonical_links, variant_links], ignore_index=True)
 
 
 def create_readme(out_dir: Path, stats: dict):
-    """Create import guide for E41 Appellation data."""
+    """Create import guide for E41 Appellation data.
+
+    The write is skipped when the existing guide already has identical text.
+    """
     readme_content = f"""# E41_Appellation Name Variants - Neo4j Import Guide
 
 **Created**: September 30, 2025
@@ -330,6 +328,10 @@ neo4j_appellations/
 """
 
     readme_path = out_dir / 'E41_APPELLATION_GUIDE.md'
+    if readme_path.exists() and readme_path.read_text() == readme_content:
+        print(f"\n  ✓ Import guide unchanged: {readme_path}", file=sys.stderr)
+        return
+
     readme_path.write_text(readme_content)
     print(f"\n  ✓ Import guide created: {readme_path}", file=sys.stderr)
 
@@ -354,7 +356,11 @@ def main():
 
     # Generate E41 appellations
     print(f"\nCreating E41_Appellation entities...", file=sys.stderr)
-    appellations = create_e41_appellations(canonical_df)
+    # OCR corrections (canonical names applied) drive both outputs
+    ocr_corrections = canonical_df[canonical_df['should_apply'] == True]
+    name_changes = int((canonical_df['reason'] == 'name_change').sum())
+    appellations = create_e41_appellations(ocr_corrections)
+    print(f"  Found {name_changes} intentional name changes (not creating E41s)", file=sys.stderr)
 
     e41_file = out_dir / 'e41_appellations.csv'
     appellations.to_csv(e41_file, index=False)
@@ -362,23 +368,25 @@ def main():
 
     # Generate P1 relationships
     print(f"\nCreating P1_is_identified_by relationships...", file=sys.stderr)
-    p1_relationships = create_p1_is_identified_by(canonical_df)
+    p1_relationships = create_p1_is_identified_by(ocr_corrections)
 
     p1_file = out_dir / 'p1_is_identified_by.csv'
     p1_relationships.to_csv(p1_file, index=False)
     print(f"  ✓ P1_is_identified_by: {len(p1_relationships)} relationships → {p1_file}", file=sys.stderr)
 
     # Calculate statistics
+    appellation_types = appellations['type'].value_counts()
+    link_types = p1_relationships['type'].value_counts()
     stats = {
         'total_records': len(canonical_df),
-        'ocr_corrections': len(canonical_df[canonical_df['should_apply'] == True]),
-        'name_changes': len(canonical_df[canonical_df['reason'] == 'name_change']),
+        'ocr_corrections': len(ocr_corrections),
+        'name_changes': name_changes,
         'total_appellations': len(appellations),
-        'canonical_appellations': len(appellations[appellations['type'] == 'canonical']),
-        'variant_appellations': len(appellations[appellations['type'] == 'variant']),
+        'canonical_appellations': int(appellation_types.get('canonical', 0)),
+        'variant_appellations': int(appellation_types.get('variant', 0)),
         'total_relationships': len(p1_relationships),
-        'canonical_links': len(p1_relationships[p1_relationships['type'] == 'canonical_name']),
-        'variant_links': len(p1_relationships[p1_relationships['type'] == 'variant_name'])
+        'canonical_links': int(link_types.get('canonical_name', 0)),
+        'variant_links': int(link_types.get('variant_name', 0))
     }
 
     # Summary
@@ -17,16 +17,44 @@ Relationships:
 """
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from shapely import make_valid
+import shapely
 import argparse
+import os
 import sys
-from typing import Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Tuple
 
+from pickle_cache import load_fresh_pickle, write_pickle_atomic
+
+
+def gdb_mtime(gdb_path: str) -> float:
+    """Latest modification time of a FileGDB directory (or single-file source)."""
+    path = Path(gdb_path)
+    if path.is_dir():
+        return max([path.stat().st_mtime] + [p.stat().st_mtime for p in path.iterdir()])
+    return path.stat().st_mtime
+
+
+def load_year_layer(gdb_path: str, year: int, cache_dir: Optional[Path] = None) -> gpd.GeoDataFrame:
+    """
+    Load CSD layer for a specific year from FileGDB.
+
+    With cache_dir set, the prepared layer (renamed, validated, reprojected,
+    with areas) is pickled there and reused while it is newer than the GDB.
+    An unreadable cache entry is ignored and the layer rebuilt.
+    """
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = Path(cache_dir) / f'{Path(gdb_path).stem}_csd_{year}.pkl'
+        gdf = load_fresh_pickle(cache_path, gdb_mtime(gdb_path))
+        if gdf is not None:
+            print(f"Loaded cached {year} layer from {cache_path}", file=sys.stderr)
+            return gdf
 
-def load_year_layer(gdb_path: str, year: int) -> gpd.GeoDataFrame:
-    """Load CSD layer for a specific year from FileGDB."""
     # Use V2T2 variant for 1911 (aligns with population data)
     if year == 1911:
         layer_name = f"CANADA_{year}_CSD_V2T2"
@@ -53,11 +81,16 @@ def load_year_layer(gdb_path: str, year: int) -> gpd.GeoDataFrame:
     cols_to_keep = ['tcpuid', 'pr', 'cd_name', 'csd_name', 'geometry']
     gdf = gdf[cols_to_keep]
 
+    # Province and CD names repeat across every CSD in a CD
+    for col in ('pr', 'cd_name'):
+        gdf[col] = gdf[col].astype('category')
+    gdf['cd_id'] = cd_place_ids(gdf).astype('category')
+
     # Validate geometries
-    invalid_mask = ~gdf.is_valid
+    invalid_mask = ~gdf.is_valid.to_numpy()
     if invalid_mask.any():
         print(f"  Fixing {invalid_mask.sum()} invalid geometries...", file=sys.stderr)
-        gdf.loc[invalid_mask, 'geometry'] = gdf.loc[invalid_mask, 'geometry'].apply(make_valid)
+        gdf.loc[invalid_mask, 'geometry'] = shapely.make_valid(np.asarray(gdf.geometry.values[invalid_mask]))
 
     # Reproject to EPSG:3347
     if gdf.crs is None or gdf.crs.to_epsg() != 3347:
@@ -66,9 +99,25 @@ def load_year_layer(gdb_path: str, year: int) -> gpd.GeoDataFrame:
 
     gdf['area'] = gdf.geometry.area
     print(f"  Loaded {len(gdf)} CSDs", file=sys.stderr)
+
+    if cache_path is not None:
+        write_pickle_atomic(gdf, cache_path)
     return gdf
 
 
+def cd_place_ids(gdf: gpd.GeoDataFrame) -> pd.Series:
+    """
+    CD place IDs (CD_{pr}_{cd_name}) for each CSD row.
+
+    The ID is formatted once per distinct (pr, cd_name) pair and shared by
+    every CSD in that CD.
+    """
+    groups = gdf.groupby(['pr', 'cd_name'], observed=True, sort=False, dropna=False)
+    cds = groups.size().index.to_frame(index=False).astype(object)
+    ids = 'CD_' + cds['pr'] + '_' + cds['cd_name'].str.replace(' ', '_')
+    return pd.Series(ids.to_numpy(dtype=object)[groups.ngroup().to_numpy()], index=gdf.index)
+
+
 def extract_e53_places(gdf: gpd.GeoDataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Extract E53_Place nodes for CSDs and CDs.
@@ -87,9 +136,9 @@ def extract_e53_places(gdf: gpd.GeoDataFrame) -> Tuple[pd.DataFrame, pd.DataFram
     }).drop_duplicates(subset=['place_id:ID'])
 
     # CD Places - extract unique CDs
-    cd_data = gdf[['cd_name', 'pr']].drop_duplicates()
+    cd_data = gdf[['cd_name', 'pr', 'cd_id']].drop_duplicates()
     cd_places = pd.DataFrame({
-        'place_id:ID': 'CD_' + cd_data['pr'] + '_' + cd_data['cd_name'].str.replace(' ', '_'),
+        'place_id:ID': cd_data['cd_id'],
         'place_type': 'CD',
         'name': cd_data['cd_name'],
         'province': cd_data['pr'],
@@ -122,30 +171,35 @@ def extract_e93_presences(gdf: gpd.GeoDataFrame, year: int) -> pd.DataFrame:
     print(f"  Extracting E93_Presence nodes for {year}...", file=sys.stderr)
 
     presences = pd.DataFrame({
-        'presence_id:ID': gdf['tcpuid'] + f'_{year}',
+        'presence_id:ID': gdf['presence_id'],
         'csd_tcpuid': gdf['tcpuid'],
         'census_year:int': year,
-        'area_sqm:float': gdf['area'].round(2),
+        'area_sqm:float': np.round(gdf['area'].to_numpy(), 2),
         ':LABEL': 'E93_Presence'
     })
 
     return presences
 
 
-def extract_e94_space_primitives(gdf: gpd.GeoDataFrame, year: int) -> pd.DataFrame:
+def extract_e94_space_primitives(gdf: gpd.GeoDataFrame, year: int, centroids_latlon: gpd.GeoSeries) -> pd.DataFrame:
     """
     Extract E94_Space_Primitive nodes - centroid coordinates.
+
+    centroids_latlon holds the CSD centroids (computed in EPSG:3347) in WGS84.
     """
     print(f"  Computing E94_Space_Primitive (centroids) for {year}...", file=sys.stderr)
 
-    # Compute centroids in EPSG:3347, convert to WGS84
-    centroids_3347 = gdf.geometry.centroid
-    centroids_latlon = centroids_3347.to_crs(epsg=4326)
+    # Coordinates come out as fresh arrays, so round them in place
+    points = np.asarray(centroids_latlon.values)
+    latitude = shapely.get_y(points)
+    longitude = shapely.get_x(points)
+    np.round(latitude, 6, out=latitude)
+    np.round(longitude, 6, out=longitude)
 
     space_primitives = pd.DataFrame({
-        'space_id:ID': gdf['tcpuid'] + f'_{year}_centroid',
-        'latitude:float': centroids_latlon.y.round(6),
-        'longitude:float': centroids_latlon.x.round(6),
+        'space_id:ID': gdf['space_id'],
+        'latitude:float': latitude,
+        'longitude:float': longitude,
         'crs': 'EPSG:4326',
         ':LABEL': 'E94_Space_Primitive'
     })
@@ -160,7 +214,7 @@ def extract_p166_was_presence_of(gdf: gpd.GeoDataFrame, year: int) -> pd.DataFra
     print(f"  Creating P166_was_a_presence_of relationships...", file=sys.stderr)
 
     relationships = pd.DataFrame({
-        ':START_ID': gdf['tcpuid'] + f'_{year}',  # presence_id
+        ':START_ID': gdf['presence_id'],
         ':END_ID': gdf['tcpuid'],  # place_id (CSD)
         ':TYPE': 'P166_was_a_presence_of'
     })
@@ -175,7 +229,7 @@ def extract_p164_temporally_specified_by(gdf: gpd.GeoDataFrame, year: int) -> pd
     print(f"  Creating P164_is_temporally_specified_by relationships...", file=sys.stderr)
 
     relationships = pd.DataFrame({
-        ':START_ID': gdf['tcpuid'] + f'_{year}',  # presence_id
+        ':START_ID': gdf['presence_id'],
         ':END_ID': f'CENSUS_{year}',  # period_id
         ':TYPE': 'P164_is_temporally_specified_by'
     })
@@ -190,8 +244,8 @@ def extract_p161_spatial_projection(gdf: gpd.GeoDataFrame, year: int) -> pd.Data
     print(f"  Creating P161_has_spatial_projection relationships...", file=sys.stderr)
 
     relationships = pd.DataFrame({
-        ':START_ID': gdf['tcpuid'] + f'_{year}',  # presence_id
-        ':END_ID': gdf['tcpuid'] + f'_{year}_centroid',  # space_id
+        ':START_ID': gdf['presence_id'],
+        ':END_ID': gdf['space_id'],  # space_id
         ':TYPE': 'P161_has_spatial_projection'
     })
 
@@ -205,135 +259,179 @@ def extract_p89_falls_within(gdf: gpd.GeoDataFrame, year: int) -> pd.DataFrame:
     """
     print(f"  Creating P89_falls_within relationships for {year}...", file=sys.stderr)
 
+    # A TCPUID split over several features should still link to its CD once
+    links = gdf[['tcpuid', 'cd_id']].drop_duplicates()
     relationships = pd.DataFrame({
-        ':START_ID': gdf['tcpuid'],  # CSD place_id
-        ':END_ID': 'CD_' + gdf['pr'] + '_' + gdf['cd_name'].str.replace(' ', '_'),  # CD place_id
+        ':START_ID': links['tcpuid'],  # CSD place_id
+        ':END_ID': links['cd_id'],  # CD place_id
         'during_period': f'CENSUS_{year}',
         ':TYPE': 'P89_falls_within'
-    }).drop_duplicates()
+    })
 
     return relationships
 
 
-def extract_p122_borders_with(gdf: gpd.GeoDataFrame, year: int) -> pd.DataFrame:
+def extract_p122_borders_with(gdf: gpd.GeoDataFrame, year: int, boundaries: np.ndarray) -> pd.DataFrame:
     """
     P122_borders_with: E53_Place (CSD) -> E53_Place (CSD)
     With properties: during_period, shared_border_length_m
+
+    boundaries holds each CSD's boundary geometry, aligned with gdf rows.
     """
     print(f"  Computing P122_borders_with relationships for {year}...", file=sys.stderr)
 
-    borders = []
-    sindex = gdf.sindex
+    # All touching pairs in one bulk spatial-index query
+    left, right = gdf.sindex.query(gdf.geometry.values, predicate='touches')
 
-    for idx, row in gdf.iterrows():
-        geom = row['geometry']
-        tcpuid = row['tcpuid']
+    # Avoid duplicates (only A->B, not B->A)
+    tcpuids = gdf['tcpuid'].to_numpy()
+    keep = tcpuids[left] < tcpuids[right]
+    left, right = left[keep], right[keep]
 
-        possible_neighbors = list(sindex.intersection(geom.bounds))
+    border_length = shapely.length(shapely.intersection(boundaries[left], boundaries[right]))
+    shared = border_length > 1.0
+    border_length = border_length[shared]
+    np.round(border_length, 2, out=border_length)
 
-        for neighbor_idx in possible_neighbors:
-            if neighbor_idx == idx:
-                continue
+    borders = pd.DataFrame({
+        ':START_ID': tcpuids[left][shared],
+        ':END_ID': tcpuids[right][shared],
+        'during_period': f'CENSUS_{year}',
+        'shared_border_length_m:float': border_length,
+        ':TYPE': 'P122_borders_with'
+    })
 
-            neighbor_row = gdf.iloc[neighbor_idx]
-            neighbor_geom = neighbor_row['geometry']
-            neighbor_tcpuid = neighbor_row['tcpuid']
+    print(f"  Found {len(borders)} border relationships", file=sys.stderr)
+    return borders
 
-            # Avoid duplicates (only A->B, not B->A)
-            if tcpuid >= neighbor_tcpuid:
-                continue
 
-            if not geom.touches(neighbor_geom):
-                continue
+def write_output(df: pd.DataFrame, path: Path, description: str, admin_import: bool = False,
+                 header_stem: Optional[str] = None) -> int:
+    """
+    Write one extracted table to CSV and return its row count.
 
-            try:
-                intersection = geom.boundary.intersection(neighbor_geom.boundary)
-                border_length = intersection.length
+    With admin_import, write a header-only <stem>_header.csv plus headerless
+    gzipped <name>.csv.gz data for neo4j-admin database import instead.
+    Outputs split across years pass header_stem so that all years share one
+    header file; it is written via a rename because every year's worker
+    writes the same header.
+    """
+    if admin_import:
+        header_path = path.with_name(f'{header_stem or path.stem}_header.csv')
+        tmp_path = header_path.with_name(f'.{header_path.name}.{os.getpid()}.tmp')
+        df.head(0).to_csv(tmp_path, index=False)
+        os.replace(tmp_path, header_path)
+        df.to_csv(path.with_name(f'{path.name}.gz'), index=False, header=False, compression='gzip')
+    else:
+        df.to_csv(path, index=False)
+    print(f"✓ Wrote {len(df)} {description}")
+    return len(df)
 
-                if border_length > 1.0:
-                    borders.append({
-                        ':START_ID': tcpuid,
-                        ':END_ID': neighbor_tcpuid,
-                        'during_period': f'CENSUS_{year}',
-                        'shared_border_length_m:float': round(border_length, 2),
-                        ':TYPE': 'P122_borders_with'
-                    })
-            except Exception as e:
-                print(f"  Warning: Border computation error: {e}", file=sys.stderr)
-                continue
 
-        if (idx + 1) % 500 == 0:
-            print(f"    Processed {idx + 1}/{len(gdf)} CSDs...", file=sys.stderr)
+# Per-year outputs written by process_year, by neo4j-admin import group
+YEAR_NODE_OUTPUTS = ['e93_presence', 'e94_space_primitive']
+YEAR_RELATIONSHIP_OUTPUTS = [
+    'p166_was_presence_of', 'p164_temporally_specified_by', 'p161_spatial_projection',
+    'p89_falls_within', 'p122_borders_with'
+]
 
-    print(f"  Found {len(borders)} border relationships", file=sys.stderr)
-    return pd.DataFrame(borders)
 
+def admin_import_command(out_dir: Path, years: List[int]) -> str:
+    """
+    Build the neo4j-admin command that loads every --admin-import output.
+
+    Each label or relationship type gets one group: its header file followed
+    by its gzipped data, with the per-year outputs listing every year's data
+    file after the shared header. Labels and relationship types come from
+    the :LABEL and :TYPE columns.
+    """
+    def group(stem: str, data_stems: List[str]) -> str:
+        files = [out_dir / f'{stem}_header.csv'] + [out_dir / f'{data}.csv.gz' for data in data_stems]
+        return ','.join(str(f) for f in files)
 
-def process_year(gdb_path: str, year: int, out_dir: Path, all_csd_places: dict, all_cd_places: set):
+    args = [f'--nodes={group(stem, [stem])}' for stem in ['e4_period', 'e53_place_csd', 'e53_place_cd']]
+    args += [f'--nodes={group(stem, [f"{stem}_{year}" for year in years])}' for stem in YEAR_NODE_OUTPUTS]
+    args += [f'--relationships={group(stem, [f"{stem}_{year}" for year in years])}'
+             for stem in YEAR_RELATIONSHIP_OUTPUTS]
+    return 'neo4j-admin database import full \\\n  ' + ' \\\n  '.join(args) + ' \\\n  neo4j'
+
+
+def process_year(gdb_path: str, year: int, out_dir: Path, cache_dir: Optional[Path] = None,
+                 admin_import: bool = False) -> Tuple[dict, Dict[str, str], Dict[str, Tuple[str, str]]]:
     """
     Process a single census year.
 
+    Runs in a worker process, so the places seen this year are returned for
+    the caller to merge rather than collected into shared containers.
+
     Returns:
-        Stats dict with counts
+        (stats dict with counts, tcpuid -> CSD name, cd_id -> (cd_name, pr))
     """
     print(f"\n{'='*60}", file=sys.stderr)
     print(f"Processing year {year}", file=sys.stderr)
     print(f"{'='*60}", file=sys.stderr)
 
-    gdf = load_year_layer(gdb_path, year)
-
+    gdf = load_year_layer(gdb_path, year, cache_dir)
     stats = {}
 
-    # E93_Presence nodes
-    presences = extract_e93_presences(gdf, year)
-    presences.to_csv(out_dir / f'e93_presence_{year}.csv', index=False)
-    stats['presences'] = len(presences)
-    print(f"✓ Wrote {len(presences)} E93_Presence nodes")
-
-    # E94_Space_Primitive nodes
-    space_primitives = extract_e94_space_primitives(gdf, year)
-    space_primitives.to_csv(out_dir / f'e94_space_primitive_{year}.csv', index=False)
-    stats['space_primitives'] = len(space_primitives)
-    print(f"✓ Wrote {len(space_primitives)} E94_Space_Primitive nodes")
-
-    # Collect unique places for later (keep most recent name for each TCPUID)
-    for _, row in gdf[['tcpuid', 'csd_name']].iterrows():
-        tcpuid = row['tcpuid']
-        csd_name = row['csd_name']
-        # Update with most recent year's name (processing in chronological order)
-        all_csd_places[tcpuid] = csd_name
-
-    for _, row in gdf[['cd_name', 'pr']].drop_duplicates().iterrows():
-        cd_id = f"CD_{row['pr']}_{row['cd_name'].replace(' ', '_')}"
-        all_cd_places.add((cd_id, row['cd_name'], row['pr']))
-
-    # Relationships
-    p166 = extract_p166_was_presence_of(gdf, year)
-    p166.to_csv(out_dir / f'p166_was_presence_of_{year}.csv', index=False)
-    stats['p166'] = len(p166)
-    print(f"✓ Wrote {len(p166)} P166_was_a_presence_of relationships")
-
-    p164 = extract_p164_temporally_specified_by(gdf, year)
-    p164.to_csv(out_dir / f'p164_temporally_specified_by_{year}.csv', index=False)
-    stats['p164'] = len(p164)
-    print(f"✓ Wrote {len(p164)} P164_is_temporally_specified_by relationships")
+    # Spatial steps first: centroids and borders are the only users of the
+    # geometries, which (with the spatial index) dominate the working set
+    centroids_latlon = gdf.geometry.centroid.to_crs(epsg=4326)
+    boundaries = shapely.boundary(gdf.geometry.values.to_numpy())
+    stats['p122'] = write_output(
+        extract_p122_borders_with(gdf, year, boundaries),
+        out_dir / f'p122_borders_with_{year}.csv', 'P122_borders_with relationships', admin_import,
+        header_stem='p122_borders_with'
+    )
+    del boundaries
+    gdf = pd.DataFrame(gdf.drop(columns='geometry'))
+
+    # Node IDs shared by the node and relationship extractors
+    gdf['presence_id'] = gdf['tcpuid'] + f'_{year}'
+    gdf['space_id'] = gdf['presence_id'] + '_centroid'
+
+    # Nodes
+    stats['presences'] = write_output(
+        extract_e93_presences(gdf, year),
+        out_dir / f'e93_presence_{year}.csv', 'E93_Presence nodes', admin_import,
+        header_stem='e93_presence'
+    )
+    stats['space_primitives'] = write_output(
+        extract_e94_space_primitives(gdf, year, centroids_latlon),
+        out_dir / f'e94_space_primitive_{year}.csv', 'E94_Space_Primitive nodes', admin_import,
+        header_stem='e94_space_primitive'
+    )
 
-    p161 = extract_p161_spatial_projection(gdf, year)
-    p161.to_csv(out_dir / f'p161_spatial_projection_{year}.csv', index=False)
-    stats['p161'] = len(p161)
-    print(f"✓ Wrote {len(p161)} P161_has_spatial_projection relationships")
+    # Collect unique places for later
+    csd_places = dict(zip(gdf['tcpuid'].to_numpy(), gdf['csd_name'].to_numpy()))
 
-    p89 = extract_p89_falls_within(gdf, year)
-    p89.to_csv(out_dir / f'p89_falls_within_{year}.csv', index=False)
-    stats['p89'] = len(p89)
-    print(f"✓ Wrote {len(p89)} P89_falls_within relationships")
+    cds = gdf[['cd_name', 'pr', 'cd_id']].dropna(subset=['cd_id'])
+    cds = cds.drop_duplicates(subset=['cd_id'])
+    cd_places = dict(zip(cds['cd_id'], zip(cds['cd_name'], cds['pr'])))
 
-    p122 = extract_p122_borders_with(gdf, year)
-    p122.to_csv(out_dir / f'p122_borders_with_{year}.csv', index=False)
-    stats['p122'] = len(p122)
-    print(f"✓ Wrote {len(p122)} P122_borders_with relationships")
+    # Relationships
+    stats['p166'] = write_output(
+        extract_p166_was_presence_of(gdf, year),
+        out_dir / f'p166_was_presence_of_{year}.csv', 'P166_was_a_presence_of relationships', admin_import,
+        header_stem='p166_was_presence_of'
+    )
+    stats['p164'] = write_output(
+        extract_p164_temporally_specified_by(gdf, year),
+        out_dir / f'p164_temporally_specified_by_{year}.csv', 'P164_is_temporally_specified_by relationships', admin_import,
+        header_stem='p164_temporally_specified_by'
+    )
+    stats['p161'] = write_output(
+        extract_p161_spatial_projection(gdf, year),
+        out_dir / f'p161_spatial_projection_{year}.csv', 'P161_has_spatial_projection relationships', admin_import,
+        header_stem='p161_spatial_projection'
+    )
+    stats['p89'] = write_output(
+        extract_p89_falls_within(gdf, year),
+        out_dir / f'p89_falls_within_{year}.csv', 'P89_falls_within relationships', admin_import,
+        header_stem='p89_falls_within'
+    )
 
-    return stats
+    return stats, csd_places, cd_places
 
 
 def main():
@@ -347,6 +445,15 @@ def main():
         help='Comma-separated census years'
     )
     parser.add_argument('--out', default='neo4j_cidoc_crm', help='Output directory')
+    parser.add_argument(
+        '--cache-dir',
+        help='Cache prepared year layers here and reuse them on later runs while newer than the GDB'
+    )
+    parser.add_argument(
+        '--admin-import',
+        action='store_true',
+        help='Write header files and gzipped data for neo4j-admin database import instead of LOAD CSV files'
+    )
 
     args = parser.parse_args()
 
@@ -359,12 +466,11 @@ def main():
     print(f"Creating E4_Period nodes", file=sys.stderr)
     print(f"{'='*60}", file=sys.stderr)
     periods = extract_e4_periods(years)
-    periods.to_csv(out_dir / 'e4_period.csv', index=False)
-    print(f"✓ Wrote {len(periods)} E4_Period nodes")
+    write_output(periods, out_dir / 'e4_period.csv', 'E4_Period nodes', args.admin_import)
 
     # Process each year
     all_csd_places = {}  # dict: tcpuid -> name (most recent)
-    all_cd_places = set()
+    all_cd_places = {}  # dict: cd_id -> (name, province) (most recent)
     total_stats = {
         'presences': 0,
         'space_primitives': 0,
@@ -375,8 +481,16 @@ def main():
         'p122': 0
     }
 
-    for year in years:
-        stats = process_year(args.gdb, year, out_dir, all_csd_places, all_cd_places)
+    # Years are independent, so run them in parallel
+    with ProcessPoolExecutor(max_workers=min(len(years), os.cpu_count() or 1)) as executor:
+        worker = partial(process_year, args.gdb, out_dir=out_dir, cache_dir=args.cache_dir,
+                         admin_import=args.admin_import)
+        results = list(executor.map(worker, years))
+
+    # Merge in chronological order so each place keeps its most recent name
+    for stats, csd_places, cd_places in results:
+        all_csd_places.update(csd_places)
+        all_cd_places.update(cd_places)
         for key in total_stats:
             total_stats[key] += stats[key]
 
@@ -390,16 +504,14 @@ def main():
         {'place_id:ID': tcpuid, 'name': name, 'place_type': 'CSD', ':LABEL': 'E53_Place'}
         for tcpuid, name in all_csd_places.items()
     ])
-    csd_places_df.to_csv(out_dir / 'e53_place_csd.csv', index=False)
-    print(f"✓ Wrote {len(csd_places_df)} E53_Place (CSD) nodes")
+    write_output(csd_places_df, out_dir / 'e53_place_csd.csv', 'E53_Place (CSD) nodes', args.admin_import)
 
     # CD Places
     cd_places_df = pd.DataFrame([
         {'place_id:ID': cd_id, 'place_type': 'CD', 'name': name, 'province': prov, ':LABEL': 'E53_Place'}
-        for cd_id, name, prov in all_cd_places
+        for cd_id, (name, prov) in all_cd_places.items()
     ])
-    cd_places_df.to_csv(out_dir / 'e53_place_cd.csv', index=False)
-    print(f"✓ Wrote {len(cd_places_df)} E53_Place (CD) nodes")
+    write_output(cd_places_df, out_dir / 'e53_place_cd.csv', 'E53_Place (CD) nodes', args.admin_import)
 
     # Summary
     print(f"\n{'='*60}", file=sys.stderr)
@@ -418,6 +530,9 @@ def main():
     print(f"P122_borders_with: {total_stats['p122']:,}", file=sys.stderr)
     print(f"\n✓ Output files in {out_dir}/", file=sys.stderr)
 
+    if args.admin_import:
+        print(f"\nImport into an empty database with:\n{admin_import_command(out_dir, years)}")
+
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
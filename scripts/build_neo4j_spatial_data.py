@@ -10,11 +10,18 @@ Output: CSV files ready for Neo4j LOAD CSV
 """
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import pyogrio
 from pathlib import Path
+from pyproj import Transformer
+import shapely
 from shapely import make_valid
 import argparse
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from typing import Tuple
 
 
@@ -23,11 +30,11 @@ def load_year_layer(gdb_path: str, year: int) -> gpd.GeoDataFrame:
     layer_name = f"CANADA_{year}_CSD"
     print(f"Loading {layer_name}...", file=sys.stderr)
 
-    gdf = gpd.read_file(gdb_path, layer=layer_name)
-
-    # Standardize column names (handle both Name_ and NAME_ variants)
+    # Standardize column names (handle both Name_ and NAME_ variants). The
+    # names are taken from the layer schema so only these columns are read.
+    fields = pyogrio.read_info(gdb_path, layer=layer_name)['fields']
     rename_map = {}
-    for col in gdf.columns:
+    for col in fields:
         if col == f'TCPUID_CSD_{year}':
             rename_map[col] = 'tcpuid'
         elif col == f'PR_{year}':
@@ -37,6 +44,7 @@ def load_year_layer(gdb_path: str, year: int) -> gpd.GeoDataFrame:
         elif col in [f'Name_CSD_{year}', f'NAME_CSD_{year}']:
             rename_map[col] = 'csd_name'
 
+    gdf = gpd.read_file(gdb_path, layer=layer_name, columns=list(rename_map), engine='pyogrio')
     gdf = gdf.rename(columns=rename_map)
 
     # Keep only needed columns
@@ -47,7 +55,7 @@ def load_year_layer(gdb_path: str, year: int) -> gpd.GeoDataFrame:
     invalid_mask = ~gdf.is_valid
     if invalid_mask.any():
         print(f"  Fixing {invalid_mask.sum()} invalid geometries...", file=sys.stderr)
-        gdf.loc[invalid_mask, 'geometry'] = gdf.loc[invalid_mask, 'geometry'].apply(make_valid)
+        gdf.loc[invalid_mask, 'geometry'] = make_valid(gdf.geometry.values[invalid_mask.to_numpy()])
 
     # Reproject to EPSG:3347 for accurate area calculations
     if gdf.crs is None or gdf.crs.to_epsg() != 3347:
@@ -78,10 +86,12 @@ def extract_csd_nodes(gdf: gpd.GeoDataFrame, year: int) -> pd.DataFrame:
     print(f"  Computing centroids...", file=sys.stderr)
 
     # Compute centroids in projected CRS (EPSG:3347)
-    centroids_3347 = gdf.geometry.centroid
+    centroids_3347 = shapely.centroid(gdf.geometry.values.to_numpy())
 
-    # Convert centroids to lat/lon (EPSG:4326 - WGS84)
-    centroids_latlon = centroids_3347.to_crs(epsg=4326)
+    # Convert centroid coordinates to lat/lon (EPSG:4326 - WGS84); only x/y
+    # are needed, so transform the coordinate arrays rather than the points
+    to_wgs84 = Transformer.from_crs(gdf.crs, 4326, always_xy=True)
+    lon, lat = to_wgs84.transform(shapely.get_x(centroids_3347), shapely.get_y(centroids_3347))
 
     # Build node dataframe
     nodes = pd.DataFrame({
@@ -91,8 +101,8 @@ def extract_csd_nodes(gdf: gpd.GeoDataFrame, year: int) -> pd.DataFrame:
         'province': gdf['pr'],
         'year:int': year,
         'area_sqm:float': gdf['area'].round(2),
-        'centroid_lat:float': centroids_latlon.y.round(6),
-        'centroid_lon:float': centroids_latlon.x.round(6)
+        'centroid_lat:float': np.round(lat, 6),
+        'centroid_lon:float': np.round(lon, 6)
     })
 
     return nodes
@@ -110,61 +120,34 @@ def compute_borders(gdf: gpd.GeoDataFrame, year: int) -> pd.DataFrame:
     """
     print(f"  Computing border adjacencies...", file=sys.stderr)
 
-    borders = []
-
-    # Use spatial index for efficiency
-    sindex = gdf.sindex
-
-    for idx, row in gdf.iterrows():
-        geom = row['geometry']
-        tcpuid = row['tcpuid']
-
-        # Find potential neighbors using bounding box
-        possible_neighbors = list(sindex.intersection(geom.bounds))
-
-        for neighbor_idx in possible_neighbors:
-            # Skip self
-            if neighbor_idx == idx:
-                continue
-
-            neighbor_row = gdf.iloc[neighbor_idx]
-            neighbor_geom = neighbor_row['geometry']
-            neighbor_tcpuid = neighbor_row['tcpuid']
-
-            # Avoid duplicate pairs (only add A->B, not B->A)
-            # Use string comparison to maintain consistent ordering
-            if tcpuid >= neighbor_tcpuid:
-                continue
-
-            # Check if they actually touch (share a border)
-            if not geom.touches(neighbor_geom):
-                continue
-
-            # Compute shared border length
-            try:
-                intersection = geom.boundary.intersection(neighbor_geom.boundary)
-                border_length = intersection.length
-
-                # Only add if there's meaningful shared border (> 1m)
-                if border_length > 1.0:
-                    borders.append({
-                        ':START_ID': tcpuid,
-                        ':END_ID': neighbor_tcpuid,
-                        'year:int': year,
-                        'shared_border_length_m:float': round(border_length, 2)
-                    })
-            except Exception as e:
-                print(f"  Warning: Border computation error between {tcpuid} and {neighbor_tcpuid}: {e}",
-                      file=sys.stderr)
-                continue
-
-        # Progress indicator
-        if (idx + 1) % 500 == 0:
-            print(f"    Processed {idx + 1}/{len(gdf)} CSDs...", file=sys.stderr)
+    # Find all touching pairs with one bulk STRtree query over the raw
+    # shapely geometry array; the predicate is evaluated inside the query
+    geoms = gdf.geometry.values.to_numpy()
+    left, right = gdf.sindex.query(geoms, predicate='touches')
+
+    # Avoid duplicate pairs (only add A->B, not B->A)
+    # Use string comparison to maintain consistent ordering
+    tcpuids = gdf['tcpuid'].to_numpy()
+    keep = tcpuids[left] < tcpuids[right]
+    left, right = left[keep], right[keep]
+
+    # Compute shared border lengths for all pairs at once
+    boundaries = shapely.boundary(geoms)
+    border_length = shapely.length(shapely.intersection(boundaries[left], boundaries[right]))
+
+    # Only add if there's meaningful shared border (> 1m)
+    shared = border_length > 1.0
+    left, right, border_length = left[shared], right[shared], border_length[shared]
+    borders = pd.DataFrame({
+        ':START_ID': tcpuids[left],
+        ':END_ID': tcpuids[right],
+        'year:int': np.full(len(left), year, dtype=np.int32),
+        'shared_border_length_m:float': np.round(border_length, 2)
+    })
 
     print(f"  Found {len(borders)} border relationships", file=sys.stderr)
 
-    return pd.DataFrame(borders)
+    return borders
 
 
 def process_year(gdb_path: str, year: int, out_dir: Path):
@@ -226,8 +209,12 @@ def main():
     total_nodes = 0
     total_borders = 0
 
-    for year in years:
-        nodes_count, borders_count = process_year(args.gdb, year, out_dir)
+    # Years are independent (own GDB layer, own output files), so run them in parallel
+    with ProcessPoolExecutor(max_workers=min(len(years), os.cpu_count() or 1)) as executor:
+        worker = partial(process_year, args.gdb, out_dir=out_dir)
+        results = list(executor.map(worker, years))
+
+    for nodes_count, borders_count in results:
         total_nodes += nodes_count
         total_borders += borders_count
 
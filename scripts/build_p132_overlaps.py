@@ -35,26 +35,27 @@ def load_csd_links(links_dir: Path) -> pd.DataFrame:
             # Filter for high-confidence links suitable for P132
             # SAME_AS: clear continuity
             # CONTAINS/WITHIN: administrative restructuring
-            suitable = df[df['relationship'].isin(['SAME_AS', 'CONTAINS', 'WITHIN'])].copy()
+            suitable = df[df['relationship'].isin(['SAME_AS', 'CONTAINS', 'WITHIN'])]
 
             # Create P132 relationships (column names are year-specific)
             tcpuid_from_col = f'tcpuid_{year_from}'
             tcpuid_to_col = f'tcpuid_{year_to}'
 
-            for _, row in suitable.iterrows():
-                all_links.append({
-                    ':START_ID': row[tcpuid_from_col] + f'_{year_from}',  # E93_Presence ID from year
-                    ':END_ID': row[tcpuid_to_col] + f'_{year_to}',        # E93_Presence ID to year
-                    'overlap_type': row['relationship'],
-                    'iou:float': row.get('iou', 0.0),
-                    'from_fraction:float': row.get('frac_from', 0.0),
-                    'to_fraction:float': row.get('frac_to', 0.0),
-                    'year_from:int': year_from,
-                    'year_to:int': year_to,
-                    ':TYPE': 'P132_spatiotemporally_overlaps_with'
-                })
-
-    return pd.DataFrame(all_links)
+            all_links.append(pd.DataFrame({
+                ':START_ID': suitable[tcpuid_from_col] + f'_{year_from}',  # E93_Presence ID from year
+                ':END_ID': suitable[tcpuid_to_col] + f'_{year_to}',        # E93_Presence ID to year
+                'overlap_type': suitable['relationship'],
+                'iou:float': suitable.get('iou', 0.0),
+                'from_fraction:float': suitable.get('frac_from', 0.0),
+                'to_fraction:float': suitable.get('frac_to', 0.0),
+                'year_from:int': year_from,
+                'year_to:int': year_to,
+                ':TYPE': 'P132_spatiotemporally_overlaps_with'
+            }))
+
+    if not all_links:
+        return pd.DataFrame()
+    return pd.concat(all_links, ignore_index=True)
 
 
 def main():
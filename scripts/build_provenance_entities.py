@@ -22,18 +22,6 @@ def create_e33_citations() -> pd.DataFrame:
     """
     E33_Linguistic_Object - Citations and DOIs for dataset components.
     """
-    citations = []
-
-    # Main spatial boundary dataset
-    citations.append({
-        'citation_id:ID': 'CITATION_TCP_SPATIAL',
-        ':LABEL': 'E33_Linguistic_Object',
-        'citation_text': 'Cunfer, Geoff; Billard, Rhianne; McClean, Sauvelm; Richard, Laurent; St-Hilaire, Marc, 2023, "The Canadian Historical GIS (Temporal Census Polygons)", Borealis, V1',
-        'doi': 'https://doi.org/10.5683/SP3/PKUZJN',
-        'version': 'V1',
-        'publication_date': '2023-06'
-    })
-
     # Census year datasets
     census_years = {
         1851: ('SP3/NRPFY5', 'V3', '2023-10', 'Cunfer, Geoff; Billard, Rhianne; McClean, Sauvelm'),
@@ -45,103 +33,78 @@ def create_e33_citations() -> pd.DataFrame:
         1911: ('SP3/7ZG4XV', 'V2', '2023-10', 'Cunfer, Geoff; Richard, Laurent; St-Hilaire, Marc'),
         1921: ('SP3/JPGS9B', 'V2', '2023-10', 'Cunfer, Geoff; Richard, Laurent; St-Hilaire, Marc')
     }
+    years = list(census_years)
+    doi_suffixes, versions, dates, authors = zip(*census_years.values())
 
-    for year, (doi_suffix, version, date, authors) in census_years.items():
-        citations.append({
-            'citation_id:ID': f'CITATION_CENSUS_{year}',
-            ':LABEL': 'E33_Linguistic_Object',
-            'citation_text': f'{authors}, 2023, "The Canadian Historical GIS, {year} [Aggregate data]", Borealis, {version}',
-            'doi': f'https://doi.org/10.5683/{doi_suffix}',
-            'version': version,
-            'publication_date': date
-        })
-
-    return pd.DataFrame(citations)
+    # Main spatial boundary dataset first, then one citation per census year
+    return pd.DataFrame({
+        'citation_id:ID': ['CITATION_TCP_SPATIAL'] + [f'CITATION_CENSUS_{year}' for year in years],
+        ':LABEL': 'E33_Linguistic_Object',
+        'citation_text': ['Cunfer, Geoff; Billard, Rhianne; McClean, Sauvelm; Richard, Laurent; St-Hilaire, Marc, 2023, "The Canadian Historical GIS (Temporal Census Polygons)", Borealis, V1']
+                         + [f'{author}, 2023, "The Canadian Historical GIS, {year} [Aggregate data]", Borealis, {version}'
+                            for year, author, version in zip(years, authors, versions)],
+        'doi': ['https://doi.org/10.5683/SP3/PKUZJN'] + [f'https://doi.org/10.5683/{suffix}' for suffix in doi_suffixes],
+        'version': ['V1', *versions],
+        'publication_date': ['2023-06', *dates]
+    })
 
 
 def create_e30_rights() -> pd.DataFrame:
     """
     E30_Right - License information for the dataset.
     """
-    rights = [{
-        'right_id:ID': 'LICENSE_CC_BY_4_0',
+    return pd.DataFrame({
+        'right_id:ID': ['LICENSE_CC_BY_4_0'],
         ':LABEL': 'E30_Right',
         'label': 'Creative Commons Attribution 4.0 International',
         'access_rights': 'Open Access',
         'license_uri': 'https://creativecommons.org/licenses/by/4.0/',
         'description': 'Permits use, sharing, and adaptation with attribution'
-    }]
-
-    return pd.DataFrame(rights)
+    })
 
 
 def create_e39_actors() -> pd.DataFrame:
     """
     E39_Actor - Dataset creators and contributors.
     """
-    actors = []
-
-    # Principal Investigators
-    pis = [
-        ('ACTOR_CUNFER_GEOFF', 'Geoff Cunfer', 'E21_Person', 'University of Saskatchewan'),
-        ('ACTOR_BILLARD_RHIANNE', 'Rhianne Billard', 'E21_Person', 'University of Saskatchewan'),
-        ('ACTOR_MCCLEAN_SAUVELM', 'Sauvelm McClean', 'E21_Person', 'University of Saskatchewan'),
-        ('ACTOR_RICHARD_LAURENT', 'Laurent Richard', 'E21_Person', 'Université Laval'),
-        ('ACTOR_ST_HILAIRE_MARC', 'Marc St-Hilaire', 'E21_Person', 'Université Laval')
+    # Principal Investigators, then the project organization and repository
+    actors = [
+        ('ACTOR_CUNFER_GEOFF', 'Geoff Cunfer', 'E21_Person', 'University of Saskatchewan', 'Principal Investigator', ''),
+        ('ACTOR_BILLARD_RHIANNE', 'Rhianne Billard', 'E21_Person', 'University of Saskatchewan', 'Principal Investigator', ''),
+        ('ACTOR_MCCLEAN_SAUVELM', 'Sauvelm McClean', 'E21_Person', 'University of Saskatchewan', 'Principal Investigator', ''),
+        ('ACTOR_RICHARD_LAURENT', 'Laurent Richard', 'E21_Person', 'Université Laval', 'Principal Investigator', ''),
+        ('ACTOR_ST_HILAIRE_MARC', 'Marc St-Hilaire', 'E21_Person', 'Université Laval', 'Principal Investigator', ''),
+        ('ACTOR_CANADIAN_PEOPLES_PROJECT', 'The Canadian Peoples / Les populations canadiennes Project', 'E74_Group',
+         'Multi-institutional collaboration', 'Project Organization', 'https://thecanadianpeoples.com/team/'),
+        ('ACTOR_BOREALIS_DATAVERSE', 'Borealis - Canadian Dataverse Repository', 'E74_Group',
+         'Scholars Portal', 'Data Repository', 'https://borealisdata.ca/dataverse/census')
     ]
+    actor_ids, names, actor_types, affiliations, roles, websites = zip(*actors)
 
-    for actor_id, name, actor_type, affiliation in pis:
-        actors.append({
-            'actor_id:ID': actor_id,
-            ':LABEL': 'E39_Actor',
-            'name': name,
-            'type': actor_type,
-            'affiliation': affiliation,
-            'orcid': '',  # Not available in public metadata
-            'role': 'Principal Investigator'
-        })
-
-    # Project organization
-    actors.append({
-        'actor_id:ID': 'ACTOR_CANADIAN_PEOPLES_PROJECT',
+    return pd.DataFrame({
+        'actor_id:ID': actor_ids,
         ':LABEL': 'E39_Actor',
-        'name': 'The Canadian Peoples / Les populations canadiennes Project',
-        'type': 'E74_Group',
-        'affiliation': 'Multi-institutional collaboration',
-        'orcid': '',
-        'role': 'Project Organization',
-        'website': 'https://thecanadianpeoples.com/team/'
+        'name': names,
+        'type': actor_types,
+        'affiliation': affiliations,
+        'orcid': '',  # Not available in public metadata
+        'role': roles,
+        'website': websites
     })
 
-    # Repository
-    actors.append({
-        'actor_id:ID': 'ACTOR_BOREALIS_DATAVERSE',
-        ':LABEL': 'E39_Actor',
-        'name': 'Borealis - Canadian Dataverse Repository',
-        'type': 'E74_Group',
-        'affiliation': 'Scholars Portal',
-        'orcid': '',
-        'role': 'Data Repository',
-        'website': 'https://borealisdata.ca/dataverse/census'
-    })
-
-    return pd.DataFrame(actors)
-
 
 def create_e65_creation() -> pd.DataFrame:
     """
     E65_Creation - Dataset creation/publication activity.
     """
-    creation = [{
-        'creation_id:ID': 'CREATION_CHGIS_TCP',
+    return pd.DataFrame({
+        'creation_id:ID': ['CREATION_CHGIS_TCP'],
         ':LABEL': 'E65_Creation',
         'label': 'Creation of Canadian Historical GIS Temporal Census Polygons',
         'description': 'Development and publication of historical census subdivision boundaries and aggregate census data for Canada 1851-1921',
         'timespan_start': '2018-01-01',  # Project start (approximate)
         'timespan_end': '2023-10-31'     # Last data version publication
-    }]
-
-    return pd.DataFrame(creation)
+    })
 
 
 def create_p67_refers_to() -> pd.DataFrame:
@@ -149,52 +112,32 @@ def create_p67_refers_to() -> pd.DataFrame:
     P67_refers_to: E33_Linguistic_Object -> E73_Information_Object
     Link citations to source files.
     """
-    relationships = []
+    years = [1851, 1861, 1871, 1881, 1891, 1901, 1911, 1921]
 
-    # Spatial dataset citation refers to all spatial data
-    relationships.append({
-        ':START_ID': 'CITATION_TCP_SPATIAL',
-        ':END_ID': 'SOURCE_TCP_SPATIAL_GDB',
+    # Spatial dataset citation refers to all spatial data; each census year
+    # citation refers to its aggregate data tables
+    return pd.DataFrame({
+        ':START_ID': ['CITATION_TCP_SPATIAL'] + [f'CITATION_CENSUS_{year}' for year in years],
+        ':END_ID': ['SOURCE_TCP_SPATIAL_GDB'] + [f'SOURCE_CENSUS_{year}_AGGREGATE' for year in years],
         ':TYPE': 'P67_refers_to',
-        'note': 'Citation for geospatial boundary dataset'
+        'note': ['Citation for geospatial boundary dataset'] + [f'Citation for {year} census aggregate data' for year in years]
     })
 
-    # Each census year citation refers to its aggregate data tables
-    for year in [1851, 1861, 1871, 1881, 1891, 1901, 1911, 1921]:
-        relationships.append({
-            ':START_ID': f'CITATION_CENSUS_{year}',
-            ':END_ID': f'SOURCE_CENSUS_{year}_AGGREGATE',
-            ':TYPE': 'P67_refers_to',
-            'note': f'Citation for {year} census aggregate data'
-        })
-
-    return pd.DataFrame(relationships)
-
 
 def create_p104_is_subject_to() -> pd.DataFrame:
     """
     P104_is_subject_to: E73_Information_Object -> E30_Right
     Link source files to license.
     """
-    relationships = []
+    years = [1851, 1861, 1871, 1881, 1891, 1901, 1911, 1921]
 
-    # Spatial dataset subject to CC BY 4.0
-    relationships.append({
-        ':START_ID': 'SOURCE_TCP_SPATIAL_GDB',
+    # Spatial dataset and each census year dataset subject to CC BY 4.0
+    return pd.DataFrame({
+        ':START_ID': ['SOURCE_TCP_SPATIAL_GDB'] + [f'SOURCE_CENSUS_{year}_AGGREGATE' for year in years],
         ':END_ID': 'LICENSE_CC_BY_4_0',
         ':TYPE': 'P104_is_subject_to'
     })
 
-    # Each census year dataset subject to CC BY 4.0
-    for year in [1851, 1861, 1871, 1881, 1891, 1901, 1911, 1921]:
-        relationships.append({
-            ':START_ID': f'SOURCE_CENSUS_{year}_AGGREGATE',
-            ':END_ID': 'LICENSE_CC_BY_4_0',
-            ':TYPE': 'P104_is_subject_to'
-        })
-
-    return pd.DataFrame(relationships)
-
 
 def create_p14_carried_out() -> pd.DataFrame:
     """
@@ -210,15 +153,11 @@ def create_p14_carried_out() -> pd.DataFrame:
         'ACTOR_CANADIAN_PEOPLES_PROJECT'
     ]
 
-    relationships = []
-    for actor_id in actors:
-        relationships.append({
-            ':START_ID': actor_id,
-            ':END_ID': 'CREATION_CHGIS_TCP',
-            ':TYPE': 'P14_carried_out'
-        })
-
-    return pd.DataFrame(relationships)
+    return pd.DataFrame({
+        ':START_ID': actors,
+        ':END_ID': 'CREATION_CHGIS_TCP',
+        ':TYPE': 'P14_carried_out'
+    })
 
 
 def create_e73_placeholder_sources() -> pd.DataFrame:
@@ -226,37 +165,26 @@ def create_e73_placeholder_sources() -> pd.DataFrame:
     Create placeholder E73_Information_Object nodes for provenance linking.
     These will be used by P67 and P104 relationships.
     """
-    sources = []
-
-    # Main spatial GDB
-    sources.append({
-        'info_object_id:ID': 'SOURCE_TCP_SPATIAL_GDB',
-        ':LABEL': 'E73_Information_Object',
-        'label': 'TCP_CANADA_CSD_202306.gdb',
-        'source_table': 'GDB',
-        'file_hash': '',
-        'access_uri': 'https://borealisdata.ca/api/access/datafile/:persistentId/?persistentId=doi:10.5683/SP3/PKUZJN',
-        'landing_page': 'https://borealisdata.ca/dataset.xhtml?persistentId=doi:10.5683/SP3/PKUZJN'
-    })
-
     # Census year aggregate datasets (placeholders)
     census_dois = {
         1851: 'SP3/NRPFY5', 1861: 'SP3/1I1C59', 1871: 'SP3/IYAR1W', 1881: 'SP3/SFG7UI',
         1891: 'SP3/QA4AKE', 1901: 'SP3/6XFJNU', 1911: 'SP3/7ZG4XV', 1921: 'SP3/JPGS9B'
     }
 
-    for year, doi_suffix in census_dois.items():
-        sources.append({
-            'info_object_id:ID': f'SOURCE_CENSUS_{year}_AGGREGATE',
-            ':LABEL': 'E73_Information_Object',
-            'label': f'{year} Census Aggregate Data Collection',
-            'source_table': 'COLLECTION',
-            'file_hash': '',
-            'access_uri': f'https://borealisdata.ca/api/access/datafile/:persistentId/?persistentId=doi:10.5683/{doi_suffix}',
-            'landing_page': f'https://borealisdata.ca/dataset.xhtml?persistentId=doi:10.5683/{doi_suffix}'
-        })
-
-    return pd.DataFrame(sources)
+    # Main spatial GDB first, then one collection per census year
+    return pd.DataFrame({
+        'info_object_id:ID': ['SOURCE_TCP_SPATIAL_GDB'] + [f'SOURCE_CENSUS_{year}_AGGREGATE' for year in census_dois],
+        ':LABEL': 'E73_Information_Object',
+        'label': ['TCP_CANADA_CSD_202306.gdb'] + [f'{year} Census Aggregate Data Collection' for year in census_dois],
+        'source_table': ['GDB'] + ['COLLECTION'] * len(census_dois),
+        'file_hash': '',
+        'access_uri': ['https://borealisdata.ca/api/access/datafile/:persistentId/?persistentId=doi:10.5683/SP3/PKUZJN']
+                      + [f'https://borealisdata.ca/api/access/datafile/:persistentId/?persistentId=doi:10.5683/{suffix}'
+                         for suffix in census_dois.values()],
+        'landing_page': ['https://borealisdata.ca/dataset.xhtml?persistentId=doi:10.5683/SP3/PKUZJN']
+                        + [f'https://borealisdata.ca/dataset.xhtml?persistentId=doi:10.5683/{suffix}'
+                           for suffix in census_dois.values()]
+    })
 
 
 def main():
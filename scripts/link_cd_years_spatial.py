@@ -40,7 +40,7 @@ def load_cd_layer(gdb_path: str, year: int) -> gpd.GeoDataFrame:
     invalid_mask = ~gdf.is_valid
     if invalid_mask.any():
         print(f"  Fixing {invalid_mask.sum()} invalid geometries...", file=sys.stderr)
-        gdf.loc[invalid_mask, 'geometry'] = gdf.loc[invalid_mask, 'geometry'].apply(make_valid)
+        gdf.loc[invalid_mask, 'geometry'] = make_valid(gdf.geometry.values[invalid_mask.to_numpy()])
 
     # Reproject to EPSG:3347
     if gdf.crs is None or gdf.crs.to_epsg() != 3347:
@@ -56,7 +56,7 @@ def load_year_layer(gdb_path: str, year: int) -> gpd.GeoDataFrame:
     invalid_mask = ~gdf.is_valid
     if invalid_mask.any():
         print(f"  Fixing {invalid_mask.sum()} invalid geometries...", file=sys.stderr)
-        gdf.loc[invalid_mask, 'geometry'] = gdf.loc[invalid_mask, 'geometry'].apply(make_valid)
+        gdf.loc[invalid_mask, 'geometry'] = make_valid(gdf.geometry.values[invalid_mask.to_numpy()])
 
     # Reproject to EPSG:3347 for accurate area calculations
     if gdf.crs is None or gdf.crs.to_epsg() != 3347:
@@ -192,37 +192,46 @@ def link_year_pair(
     high_confidence = []
     ambiguous = []
 
+    # Columnar views so the loops index arrays instead of building row Series
+    from_tcpuid = gdf_from['tcpuid'].to_numpy()
+    from_csd_name = gdf_from['csd_name'].to_numpy()
+    from_cd_name = gdf_from['cd_name'].to_numpy()
+    from_pr = gdf_from['pr'].to_numpy()
+    from_geoms = gdf_from.geometry.values
+    from_areas = gdf_from['area'].to_numpy()
+    to_tcpuid = gdf_to['tcpuid'].to_numpy()
+    to_csd_name = gdf_to['csd_name'].to_numpy()
+    to_cd_name = gdf_to['cd_name'].to_numpy()
+    to_pr = gdf_to['pr'].to_numpy()
+    to_geoms = gdf_to.geometry.values
+    to_areas = gdf_to['area'].to_numpy()
+
     # Process each FROM CSD
     print("  Computing overlaps...", file=sys.stderr)
-    for from_idx, from_row in gdf_from.iterrows():
-        from_geom = from_row['geometry']
-        from_area = from_row['area']
+    for from_idx in range(len(gdf_from)):
+        from_geom = from_geoms[from_idx]
+        from_area = from_areas[from_idx]
 
-        # Find potential overlaps using spatial index
-        possible_matches_idx = list(sindex.intersection(from_geom.bounds))
+        # Find intersecting CSDs; the predicate is evaluated inside the STRtree
+        possible_matches_idx = sindex.query(from_geom, predicate='intersects')
 
-        if not possible_matches_idx:
+        if not len(possible_matches_idx):
             continue
 
         # Check actual overlaps
         for to_idx in possible_matches_idx:
-            to_row = gdf_to.iloc[to_idx]
-            to_geom = to_row['geometry']
-            to_area = to_row['area']
-
-            # Quick test: do they actually intersect?
-            if not from_geom.intersects(to_geom):
-                continue
+            to_geom = to_geoms[to_idx]
+            to_area = to_areas[to_idx]
 
             # Compute spatial overlap
             iou, frac_from, frac_to = analyze_overlap(from_geom, to_geom, from_area, to_area)
 
             # Compute name similarity
             name_sim = compute_name_similarity(
-                from_row['csd_name'],
-                to_row['csd_name'],
-                from_row['cd_name'],
-                to_row['cd_name']
+                from_csd_name[from_idx],
+                to_csd_name[to_idx],
+                from_cd_name[from_idx],
+                to_cd_name[to_idx]
             )
 
             # Classify relationship
@@ -233,14 +242,14 @@ def link_year_pair(
 
             # Build link record
             link = {
-                f'tcpuid_{year_from}': from_row['tcpuid'],
-                f'csd_name_{year_from}': from_row['csd_name'],
-                f'cd_name_{year_from}': from_row['cd_name'],
-                f'pr_{year_from}': from_row['pr'],
-                f'tcpuid_{year_to}': to_row['tcpuid'],
-                f'csd_name_{year_to}': to_row['csd_name'],
-                f'cd_name_{year_to}': to_row['cd_name'],
-                f'pr_{year_to}': to_row['pr'],
+                f'tcpuid_{year_from}': from_tcpuid[from_idx],
+                f'csd_name_{year_from}': from_csd_name[from_idx],
+                f'cd_name_{year_from}': from_cd_name[from_idx],
+                f'pr_{year_from}': from_pr[from_idx],
+                f'tcpuid_{year_to}': to_tcpuid[to_idx],
+                f'csd_name_{year_to}': to_csd_name[to_idx],
+                f'cd_name_{year_to}': to_cd_name[to_idx],
+                f'pr_{year_to}': to_pr[to_idx],
                 'relationship': rel_type,
                 'iou': round(iou, 4),
                 'frac_from': round(frac_from, 4),
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Opt-in pickle cache shared by the census and CIDOC-CRM builders.
+
+Parsed Excel sheets and prepared GDB layers are expensive to rebuild, so the
+builders can keep a pickle of them in a --cache-dir. A cache entry is used
+only while it is newer than its source and loads cleanly; anything else
+(missing, stale, truncated by an interrupted run) is treated as a miss and
+the caller rebuilds. Entries are written to a temporary file and renamed
+into place, so an interrupted write never leaves a partial pickle behind.
+"""
+
+import hashlib
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+
+def load_fresh_pickle(cache_path, source_mtime):
+    """
+    Load a cached pickle if it is at least as new as its source.
+
+    Args:
+        cache_path: Path of the cache entry
+        source_mtime: Modification time of the data the entry was built from
+
+    Returns:
+        The cached object, or None when the entry is missing, stale or
+        unreadable
+    """
+    cache_path = Path(cache_path)
+    try:
+        if cache_path.stat().st_mtime < source_mtime:
+            return None
+        return pd.read_pickle(cache_path)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"    Warning: ignoring unreadable cache {cache_path}: {e}", file=sys.stderr)
+        return None
+
+
+def write_pickle_atomic(obj, cache_path):
+    """
+    Pickle obj to cache_path via a temporary file in the same directory.
+
+    Failures only print a warning; the cache is an optimisation.
+    """
+    cache_path = Path(cache_path)
+    tmp_path = None
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=f'.{cache_path.name}.', suffix='.tmp')
+        os.close(fd)
+        pd.to_pickle(obj, tmp_path)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"    Warning: could not write cache {cache_path}: {e}", file=sys.stderr)
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def excel_cache_path(cache_dir, path, skiprows=None):
+    """
+    Cache entry for a parsed Excel sheet.
+
+    Workbooks in different directories can share a name, so the entry name
+    carries a short hash of the workbook's resolved path.
+    """
+    path = Path(path)
+    key = hashlib.blake2b(str(path.resolve()).encode('utf-8'), digest_size=4).hexdigest()
+    suffix = f'.skip{skiprows}' if skiprows else ''
+    return Path(cache_dir) / f'{path.stem}{suffix}-{key}.pkl'
+
+
+def read_excel_cached(path, skiprows=None, cache_dir=None):
+    """
+    Read an Excel sheet, reusing a cached parse from cache_dir when possible.
+
+    Args:
+        path: Workbook path
+        skiprows: Passed to pd.read_excel
+        cache_dir: Cache directory, or None to always parse the workbook
+
+    Returns:
+        Parsed DataFrame
+    """
+    path = Path(path)
+    if cache_dir is None:
+        return pd.read_excel(path, skiprows=skiprows)
+
+    cache_path = excel_cache_path(cache_dir, path, skiprows)
+    df = load_fresh_pickle(cache_path, path.stat().st_mtime)
+    if df is None:
+        df = pd.read_excel(path, skiprows=skiprows)
+        write_pickle_atomic(df, cache_path)
+    return df